@@ -0,0 +1,2 @@
+from .core import InstallError, load_config
+from .api import InstallPlan, InstallResult, Installer, PackageResult
@@ -0,0 +1,140 @@
+import argparse
+import dataclasses
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from . import core
+
+# every plan and install has its own core.Run, only those into the same prefix (sharing its journal and install state) wait for each other
+prefixLocks: Dict[str, threading.Lock] = {}
+
+def prefix_lock(prefix: str) -> threading.Lock:
+    return prefixLocks.setdefault(prefix, threading.Lock())
+
+@dataclasses.dataclass
+class InstallPlan:
+    # everything an installation does, decided up front by Installer.plan. A plan is plain data,
+    # dataclasses.asdict(plan) can be stored as JSON and InstallPlan(**stored) installs it again later
+    models: List[str]
+    prefix: str
+    jobs: int = 1
+    # version of every package the plan installs, by the names used in config.yml
+    versions: Dict[str, str] = dataclasses.field(default_factory=dict)
+    # system dependencies (GSL, Boost, cmake) built from source and optional packages installed
+    fromSource: List[str] = dataclasses.field(default_factory=list)
+    components: List[str] = dataclasses.field(default_factory=list)
+    buildProfile: Optional[str] = None
+    # the other command line options of install.py, by their argparse names
+    options: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    # the toolchain the plan was made for
+    toolchain: Dict[str, Any] = dataclasses.field(default_factory=dict)
+
+@dataclasses.dataclass
+class PackageResult:
+    package: str
+    version: Optional[str]
+    # None if the package comes from the system or wasn't installed
+    path: Optional[str]
+    wall: float = 0
+    cpu: float = 0
+    peakRSS: int = 0
+    downloaded: int = 0
+    # the phases of the run (download, configure, build, install, ...) as in the --report file
+    phases: List[Dict[str, Any]] = dataclasses.field(default_factory=list)
+
+@dataclasses.dataclass
+class InstallResult:
+    plan: InstallPlan
+    succeeded: bool
+    # why the installation stopped, None if it succeeded
+    error: Optional[str]
+    flexiblesusy: str
+    # run_<model>.x of every model that was built
+    spectrumGenerators: Dict[str, str]
+    packages: Dict[str, PackageResult]
+    wall: float
+    logDir: str
+
+class Installer:
+    # installs FlexibleSUSY and its dependencies in-process, e.g.
+    #
+    #   installer = Installer('config.yml', compiler_cache='auto')
+    #   plan = installer.plan(['SM', 'MSSM'], prefix='/opt/flexiblesusy/env1', jobs=8)
+    #   result = installer.install(plan)
+    #
+    # config is the path of a config.yml or its content and is read by every plan and install, options are the command line
+    # options of install.py by their argparse names. Questions the install profile doesn't answer raise an InstallError,
+    # unless yes=True or non_interactive=False (then they are asked on the terminal)
+    def __init__(self, config: Union[str, Dict[str, Any], None] = None, **options: Any):
+        self.config = config
+        self.options = {'non_interactive': True, **options}
+
+    def arguments(self, models: List[str], options: Dict[str, Any]) -> argparse.Namespace:
+        args = core.argument_parser().parse_args([','.join(models)])
+        for name, value in options.items():
+            if name in ['models', 'config', 'pin_checksums'] or not hasattr(args, name):
+                raise TypeError(f'unknown option {name}')
+            setattr(args, name, value)
+        return args
+
+    def plan(self, models: List[str], prefix: Optional[str] = None, jobs: int = 1, buildProfile: Optional[str] = None) -> InstallPlan:
+        # probes the toolchain (cached in the prefix) and answers the questions, nothing is installed yet
+        options = {name: value for name, value in self.options.items() if name not in ['prefix', 'jobs', 'build_profile']}
+        args = self.arguments(models, dict(options, prefix=prefix or self.options.get('prefix'), jobs=jobs, build_profile=buildProfile or self.options.get('build_profile')))
+        run = core.Run(args, self.config)
+        with prefix_lock(run.prefix):
+            toolchain = run.check_toolchain()
+            failedRun = run.read_journal()
+            if args.resume and failedRun is not None and 'plan' in failedRun:
+                # a resumed run keeps the answers of the failed one
+                fromSource, components = failedRun['plan']['fromSource'], failedRun['plan']['components']
+            else:
+                fromSource, components = run.decide()
+        versions = {package: str(run.config['versions'][package]) for package in ['FlexibleSUSY', 'Eigen'] + fromSource + components}
+        return InstallPlan(list(models), run.prefix, args.jobs, versions, fromSource, components, run.buildProfile, options, toolchain)
+
+    def install(self, plan: InstallPlan) -> InstallResult:
+        # a failed installation is reported in the result, with the build trees kept for options resume=True
+        args = self.arguments(plan.models, dict(plan.options, prefix=plan.prefix, jobs=plan.jobs, build_profile=plan.buildProfile))
+        run = core.Run(args, self.config)
+        with prefix_lock(run.prefix):
+            error = None
+            try:
+                run.check_toolchain(verbose=False)
+                run.start_journal()
+                run.journal['plan'] = dataclasses.asdict(plan)
+                run.run_installation(run.install_graph(plan.fromSource, plan.components))
+            except core.InstallError as e:
+                error = str(e)
+            except Exception as e:
+                # failed downloads, corrupted archives, ... end the installation just the same
+                error = f'{type(e).__name__}: {e}'
+            return self.result(run, plan, error)
+
+    def result(self, run: core.Run, plan: InstallPlan, error: Optional[str]) -> InstallResult:
+        state = run.read_state()
+        fsPath = os.path.join(run.prefix, f'FlexibleSUSY-{plan.versions["FlexibleSUSY"]}')
+        packages = {}
+        for package, version in plan.versions.items():
+            entry = state.get(package) or {}
+            path = entry.get('prefix') if entry.get('complete') and entry.get('version') == version else None
+            if package == 'FlexibleSUSY':
+                path = fsPath if os.path.isdir(fsPath) else None
+            phases = [dict(e) for e in run.report if e['package'] == package]
+            packages[package] = PackageResult(
+                package, version, path,
+                wall=sum(e['wall'] for e in phases), cpu=sum(e.get('cpu', 0) for e in phases),
+                peakRSS=max((e.get('peakRSS', 0) for e in phases), default=0), downloaded=sum(e.get('bytes', 0) for e in phases), phases=phases,
+            )
+        # the system dependencies with the versions the toolchain probe found
+        for package, key in [('GSL', 'gsl'), ('Boost', 'boost'), ('cmake', 'cmake')]:
+            if package not in plan.fromSource:
+                packages[package] = PackageResult(package, plan.toolchain.get(key), None)
+        spectrumGenerators = {}
+        for model in plan.models:
+            executable = os.path.join(fsPath, 'models', model, f'run_{model}.x')
+            if os.path.exists(executable):
+                spectrumGenerators[model] = executable
+        return InstallResult(plan, error is None, error, fsPath, spectrumGenerators, packages, time.monotonic() - run.runStart, run.logDir)
@@ -0,0 +1,37 @@
+import http.client
+import sys
+
+from . import core
+from .api import Installer
+
+def main(argv=None):
+    parser = core.argument_parser()
+    args = parser.parse_args(argv)
+    if args.pin_checksums:
+        try:
+            core.Run(args).pin_checksums()
+        except (core.InstallError, OSError, http.client.HTTPException) as error:
+            print(error)
+            sys.exit(1)
+        return
+    if args.models is None:
+        parser.error('the following arguments are required: models')
+    options = vars(args)
+    models = options.pop('models').split(',')
+    jobs = options.pop('jobs')
+    prefix = options.pop('prefix')
+    buildProfile = options.pop('build_profile')
+    options.pop('pin_checksums')
+    installer = Installer(options.pop('config'), **options)
+
+    # the progress of the builds is shown in the last line of the terminal
+    sys.stdout = core.StatusLine(sys.stdout)
+    try:
+        plan = installer.plan(models, prefix, jobs, buildProfile)
+    except core.InstallError as error:
+        print(error)
+        sys.exit(1)
+    result = installer.install(plan)
+    if not result.succeeded:
+        print(result.error)
+        sys.exit(1)
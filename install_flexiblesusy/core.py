@@ -0,0 +1,2143 @@
+import yaml
+import shutil
+import os
+import sys
+import subprocess
+import re
+import urllib.parse
+import http.client
+import random
+import tempfile
+import pathlib
+import argparse
+import hashlib
+import json
+import fcntl
+import contextlib
+import tarfile
+import platform
+import io
+import shlex
+import time
+import csv
+import collections
+import logging
+import logging.handlers
+import threading
+import concurrent.futures
+import glob
+import zlib
+import math
+import stat
+
+# scan.py and test/ are next to this package
+resourcePath = pathlib.Path(__file__).parent.parent.resolve()
+
+QUESTION = 'We recommend you install it using your linux disctibution package manager or I can try installing it from source'
+
+class InstallError(Exception):
+    # the installation can't go on, the message says why
+    pass
+
+def argument_parser():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('models', nargs='?', help='comma separated list of models to be passed to FlexibleSUSY --with-models option')
+    parser.add_argument('-j', '--jobs', type=int, default=1, required=False, help='parallelization')
+    parser.add_argument('--config', default='config.yml', help='configuration file with the package versions and the install profile (default: config.yml)')
+    parser.add_argument('--prefix', required=False, help='directory to install FlexibleSUSY and FlexibleSUSY-deps in (default: the directory of this script)')
+    parser.add_argument('--cache-dir', required=False, help='directory of the download cache (default: $FLEXIBLESUSY_INSTALL_CACHE or ~/.cache/install-flexiblesusy)')
+    parser.add_argument('--cache-size', type=float, default=5, required=False, help='maximal size of the download cache in GB, least recently used archives are removed first')
+    parser.add_argument('--no-cache', action='store_true', help='do not use the download cache')
+    parser.add_argument('--offline', action='store_true', help='take all archives from the download cache, never access the network')
+    parser.add_argument('--artifact-dir', required=False, help='directory (e.g. on a shared file system) with prebuilt dependencies (default: $FLEXIBLESUSY_INSTALL_ARTIFACTS)')
+    parser.add_argument('--artifact-mode', choices=['readwrite', 'read', 'write'], default='readwrite', help='unpack prebuilt dependencies from the artifact directory (read), pack freshly built ones into it (write) or both')
+    parser.add_argument('--profile', required=False, help='YAML file with the install profile, replaces the profile section of config.yml')
+    parser.add_argument('-y', '--yes', action='store_true', help='answer yes to every question which is not answered by the install profile')
+    parser.add_argument('--non-interactive', action='store_true', help='never ask, stop if a question is not answered by the install profile')
+    parser.add_argument('--model-targets', action='store_true', help='build only the library and the spectrum generator of each model, all models at once')
+    parser.add_argument('--compiler-cache', choices=['none', 'auto', 'ccache', 'sccache'], default='none', help='compile through ccache or sccache (auto: whichever is found)')
+    parser.add_argument('--report', required=False, help='write the time, CPU time, peak memory and downloaded bytes of every installation phase to this file (.json or .csv)')
+    parser.add_argument('--trace', required=False, help='write the installation phases as a Chrome trace (chrome://tracing, ui.perfetto.dev) to this file')
+    parser.add_argument('--build-profile', choices=['debug', 'release', 'native', 'lto', 'pgo'], help='compiler flags of FlexibleSUSY and of the dependencies built from source (default: buildProfile in config.yml, otherwise the flags of every package)')
+    parser.add_argument('--benchmark', nargs='?', type=int, const=5, metavar='REPEATS', help='after the installation run every model REPEATS times (default 5) on its example inputs and compare the speed with the previous installation')
+    parser.add_argument('--dataset-store', required=False, help='directory of the deduplicated HiggsBounds/HiggsSignals dataset store, can be shared (default: $FLEXIBLESUSY_DATASET_STORE, datasetStore in config.yml or ~/.local/share/install-flexiblesusy/datasets)')
+    parser.add_argument('--build-root', required=False, help=f'directories to build the dependencies in, separated by {os.pathsep}, the first with enough free space is used (default: $FLEXIBLESUSY_BUILD_ROOT, buildRoot in config.yml or /dev/shm{os.pathsep}the system temporary directory)')
+    parser.add_argument('--keep-failed', action='store_true', help='keep the build trees if the installation fails')
+    parser.add_argument('--resume', action='store_true', help='continue a failed run after its last completed step, with the same answers')
+    parser.add_argument('--reprobe', action='store_true', help='detect the compilers and system libraries again instead of using the cached result')
+    parser.add_argument('--log-dir', required=False, help='directory of the build logs (default: FlexibleSUSY-deps/logs)')
+    parser.add_argument('--pin-checksums', action='store_true', help='download the source archive of every version in the config file and write its sha256 into the checksums section, nothing is installed')
+    return parser
+
+def load_config(configuration):
+    # configuration is the path of a config.yml or its already parsed content
+    if isinstance(configuration, dict):
+        return configuration
+    with open(configuration, 'r') as file:
+        return yaml.safe_load(file)
+
+promptLock = threading.Lock()
+
+LOG_SIZE = 100 * 1024**2
+LOG_BACKUPS = 5
+LOG_TAIL = 50
+
+class StatusLine:
+    # on a terminal the last line shows the progress of all running builds,
+    # everything printed in the meantime (this replaces sys.stdout) appears above it
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.RLock()
+        self.builds = {}
+        self.shown = False
+        self.lastDraw = 0
+
+    def update(self, key, text):
+        with self.lock:
+            self.builds[key] = text
+            if time.monotonic() - self.lastDraw > 0.2:
+                self.draw()
+
+    def done(self, key):
+        with self.lock:
+            self.builds.pop(key, None)
+            self.draw()
+
+    def draw(self):
+        # a prompt waiting for an answer must not be overwritten
+        if not self.stream.isatty() or promptLock.locked():
+            return
+        line = ' | '.join(f'{key}: {text}' for key, text in self.builds.items())
+        self.stream.write('\r\033[K' + line[:shutil.get_terminal_size().columns - 1])
+        self.stream.flush()
+        self.shown = bool(line)
+        self.lastDraw = time.monotonic()
+
+    def write(self, text):
+        with self.lock:
+            if self.shown:
+                self.stream.write('\r\033[K')
+                self.shown = False
+            self.stream.write(text)
+            if text.endswith('\n') and self.builds:
+                self.draw()
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+def build_progress(line, state):
+    # progress of a build from one line of its output, state is kept between the lines of one command
+    state['lines'] = state.get('lines', 0) + 1
+    match = re.match(r'\[\s*(\d+)%\]', line)
+    if match:
+        # makefiles generated by CMake
+        state['progress'] = f'{match.group(1)}%'
+    match = re.match(r'\[(\d+)/(\d+)\]', line)
+    if match:
+        # ninja
+        state['progress'] = f'{100 * int(match.group(1)) // int(match.group(2))}%'
+    match = re.match(r'\.\.\.updating (\d+) targets?\.\.\.', line)
+    if match:
+        state['targets'] = int(match.group(1))
+        state['done'] = 0
+    elif state.get('targets') and re.match(r'[\w+-]+\.[\w.+-]+ ', line):
+        # b2 prints every action it runs, e.g. gcc.compile.c++ bin.v2/...
+        state['done'] += 1
+        state['progress'] = f'{min(99, 100 * state["done"] // state["targets"])}%'
+    return state.get('progress', f'{state["lines"]} lines')
+
+REPORT_FIELDS = ['package', 'phase', 'detail', 'start', 'wall', 'cpu', 'peakRSS', 'bytes', 'source', 'thread']
+
+cacheLock = threading.Lock()
+
+SOURCES = {
+    'cmake': 'https://github.com/Kitware/CMake/releases/download/v{version}/cmake-{version}.tar.gz',
+    'FlexibleSUSY': 'https://github.com/FlexibleSUSY/FlexibleSUSY/archive/refs/tags/v{version}.tar.gz',
+    'GM2Calc': 'https://github.com/GM2Calc/GM2Calc/archive/refs/tags/v{version}.tar.gz',
+    'Eigen': 'https://gitlab.com/libeigen/eigen/-/archive/{version}/eigen-{version}.tar.gz',
+    'Boost': 'https://archives.boost.io/release/{version}/source/boost_{versionUnderscore}.tar.gz',
+    'GSL': 'https://mirror.ibcp.fr/pub/gnu/gsl/gsl-{version}.tar.gz',
+    'COLLIER': 'https://collier.hepforge.org/downloads/collier-{version}.tar.gz',
+    'LoopTools': 'https://feynarts.de/looptools/LoopTools-{version}.tar.gz',
+    'Himalaya': 'https://github.com/Himalaya-Library/Himalaya/archive/refs/tags/{version}.tar.gz',
+    'HiggsBounds': 'https://gitlab.com/higgsbounds/hbdataset/-/archive/v{version}/hbdataset-v{version}.tar.gz',
+    'HiggsSignals': 'https://gitlab.com/higgsbounds/hsdataset/-/archive/v{version}/hsdataset-v{version}.tar.gz',
+    'HiggsTools': 'https://gitlab.com/higgsbounds/higgstools/-/archive/v{version}/higgstools-v{version}.tar.gz',
+}
+
+# seconds without progress and number of retries of a download, unless config.yml says otherwise
+DOWNLOAD_TIMEOUT = 30
+DOWNLOAD_RETRIES = 4
+DOWNLOAD_BACKOFF = 1
+PROBE_SIZE = 256 * 1024
+
+class DownloadError(OSError):
+    # status is the HTTP status of the response, None if the mirror misbehaved otherwise (reason says how)
+    def __init__(self, url, status, reason=None):
+        super().__init__(f'HTTP {status} from {url}' if status is not None else f'{reason} from {url}')
+        self.status = status
+        self.reason = reason
+
+def retryable(error):
+    # server errors and broken or stalled connections are worth another try, e.g. a 404 or a redirect loop isn't
+    if not isinstance(error, DownloadError):
+        return True
+    return error.status is not None and (error.status >= 500 or error.status == 429)
+
+class ConnectionPool:
+    # keeps the connections to every host open between requests, e.g. for the many files of a dataset
+    def __init__(self):
+        self.idle = collections.defaultdict(list)
+        self.lock = threading.Lock()
+
+    def get(self, scheme, host, timeout):
+        with self.lock:
+            if self.idle[(scheme, host)]:
+                connection = self.idle[(scheme, host)].pop()
+                # the connection may have been opened by a run with another timeout
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                return connection, True
+        connection = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return connection(host, timeout=timeout), False
+
+    def put(self, scheme, host, connection):
+        with self.lock:
+            self.idle[(scheme, host)].append(connection)
+
+connections = ConnectionPool()
+
+def http_request(url, headers=None, timeout=DOWNLOAD_TIMEOUT):
+    # GET with redirects followed, returns the response and a function giving the connection back once the body is read
+    for _ in range(10):
+        parts = urllib.parse.urlsplit(url)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        connection, reused = connections.get(parts.scheme, parts.netloc, timeout)
+        try:
+            connection.request('GET', path, headers={'User-Agent': 'install-flexiblesusy', **(headers or {})})
+            response = connection.getresponse()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            if not reused:
+                raise
+            # the server closed the idle connection in the meantime
+            continue
+        release = lambda parts=parts, connection=connection: connections.put(parts.scheme, parts.netloc, connection)
+        if response.status in [301, 302, 303, 307, 308]:
+            response.read()
+            release()
+            url = urllib.parse.urljoin(url, response.getheader('Location'))
+            continue
+        if response.status >= 400:
+            response.read()
+            release()
+            raise DownloadError(url, response.status)
+        return response, release
+    raise DownloadError(url, None, 'too many redirects')
+
+def retrying(action, description, retries=DOWNLOAD_RETRIES):
+    # exponential backoff between the attempts
+    for attempt in range(retries + 1):
+        try:
+            return action()
+        except (OSError, http.client.HTTPException) as error:
+            if not retryable(error) or attempt == retries:
+                raise
+            delay = DOWNLOAD_BACKOFF * 2**attempt * random.uniform(0.5, 1)
+            print(f'{description} failed ({error}), retrying in {delay:.1f}s')
+            time.sleep(delay)
+
+def http_get(url, timeout=DOWNLOAD_TIMEOUT, retries=DOWNLOAD_RETRIES):
+    # body and headers of a small response
+    def get():
+        response, release = http_request(url, timeout=timeout)
+        body = response.read()
+        release()
+        return body, response.headers
+    return retrying(get, url, retries)
+
+def probe(url, timeout=DOWNLOAD_TIMEOUT):
+    # seconds to fetch the first PROBE_SIZE bytes, None if the mirror doesn't answer
+    start = time.monotonic()
+    try:
+        response, release = http_request(url, {'Range': f'bytes=0-{PROBE_SIZE - 1}'}, timeout)
+        if response.status == 206:
+            response.read()
+            release()
+        else:
+            # the mirror sends the whole file, the connection can't be reused
+            response.read(PROBE_SIZE)
+            response.close()
+    except (OSError, http.client.HTTPException):
+        return None
+    return time.monotonic() - start
+
+def rank_mirrors(urls, timeout=DOWNLOAD_TIMEOUT):
+    # the mirrors are probed at the same time and tried from the fastest to the slowest
+    if len(urls) == 1:
+        return urls
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        times = list(pool.map(lambda url: probe(url, timeout), urls))
+    order = sorted(range(len(urls)), key=lambda i: (times[i] is None, times[i] or 0, i))
+    return [urls[i] for i in order]
+
+class MirrorStream:
+    # file-like download, a broken or stalled transfer continues where it stopped (HTTP Range) after a backoff,
+    # and on the next mirror once the retries are used up
+    def __init__(self, urls, timeout=DOWNLOAD_TIMEOUT, retries=DOWNLOAD_RETRIES):
+        self.urls = list(urls)
+        self.timeout = timeout
+        self.retries = retries
+        self.offset = 0
+        self.total = None
+        self.response = None
+        self.finished = False
+
+    def open(self):
+        headers = {'Range': f'bytes={self.offset}-'} if self.offset else {}
+        response, release = http_request(self.urls[0], headers, self.timeout)
+        if response.status == 206:
+            match = re.match(r'bytes (\d+)-\d+/(\d+)', response.getheader('Content-Range') or '')
+            if not match or int(match.group(1)) != self.offset:
+                response.close()
+                raise DownloadError(self.urls[0], None, 'unexpected Content-Range')
+            self.total = int(match.group(2))
+        else:
+            length = response.getheader('Content-Length')
+            self.total = int(length) if length is not None else None
+            # the mirror doesn't do ranges, the part which was already read is skipped
+            skip = self.offset
+            while skip > 0:
+                chunk = response.read(min(skip, 1 << 20))
+                if not chunk:
+                    response.close()
+                    raise http.client.IncompleteRead(b'')
+                skip -= len(chunk)
+        self.response, self.release = response, release
+
+    def read(self, size=-1):
+        attempt = 0
+        while not self.finished:
+            try:
+                if self.response is None:
+                    self.open()
+                data = self.response.read(size if size >= 0 else None)
+                if data:
+                    self.offset += len(data)
+                    return data
+                if self.total is not None and self.offset < self.total:
+                    # http.client doesn't complain about a connection closed too early
+                    raise http.client.IncompleteRead(b'', self.total - self.offset)
+                self.release()
+                self.response = None
+                self.finished = True
+            except (OSError, http.client.HTTPException) as error:
+                if self.response is not None:
+                    self.response.close()
+                    self.response = None
+                if retryable(error) and attempt < self.retries:
+                    delay = DOWNLOAD_BACKOFF * 2**attempt * random.uniform(0.5, 1)
+                    attempt += 1
+                    print(f'Download from {self.urls[0]} failed ({error!r}), continuing at byte {self.offset} in {delay:.1f}s')
+                    time.sleep(delay)
+                elif len(self.urls) > 1:
+                    print(f'Download from {self.urls[0]} failed ({error!r}), continuing from {self.urls[1]}')
+                    self.urls.pop(0)
+                    attempt = 0
+                else:
+                    raise
+        return b''
+
+    def close(self):
+        if self.response is not None:
+            self.response.close()
+            self.response = None
+
+class HashingReader:
+    # file-like wrapper which hashes (and optionally copies) everything read from the stream
+    def __init__(self, stream, copy=None):
+        self.stream = stream
+        self.copy = copy
+        self.sha = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.sha.update(data)
+        self.size += len(data)
+        if self.copy is not None:
+            self.copy.write(data)
+        return data
+
+def checked_member(member, destination):
+    # what filter='tar' does, for the Pythons which don't have it (before 3.9.17, 3.10.12 and 3.11.4): entries and links
+    # leading out of destination (absolute, .. or through a link extracted before) are refused, setuid/setgid bits and
+    # write access for group and others are dropped
+    root = os.path.realpath(destination)
+    def inside(path):
+        return not os.path.isabs(path) and os.path.commonpath([root, os.path.realpath(os.path.join(root, path))]) == root
+    if not inside(member.name):
+        raise tarfile.TarError(f'{member.name} would be extracted outside of {destination}')
+    if member.issym() and not inside(os.path.join(os.path.dirname(member.name), member.linkname)) or member.islnk() and not inside(member.linkname):
+        raise tarfile.TarError(f'{member.name} links to {member.linkname} outside of {destination}')
+    member.mode &= ~(stat.S_ISUID | stat.S_ISGID | stat.S_IWGRP | stat.S_IWOTH)
+    return member
+
+def extract_members(tar, destination, members):
+    # the archives come from mirrors and shared directories, nothing may end up outside destination
+    if hasattr(tarfile, 'tar_filter'):
+        tar.extractall(destination, members=members, filter='tar')
+    else:
+        # checked one by one as they are extracted, so that links extracted before are taken into account
+        tar.extractall(destination, members=(checked_member(m, destination) for m in members))
+
+def extract_stream(reader, destination):
+    # unpacks the tar stream while it is read, returns the extracted top level entries and the sha256 of the whole stream
+    extracted = set()
+    def members(tar):
+        for member in tar:
+            extracted.add(member.name.split('/')[0])
+            yield member
+    with tarfile.open(fileobj=reader, mode='r|*') as tar:
+        extract_members(tar, destination, members(tar))
+    # the end of the archive (padding) is not read by tarfile but is part of the checksum
+    while reader.read(1 << 20):
+        pass
+    return extracted, reader.sha.hexdigest()
+
+# errors of a truncated or corrupted archive
+ARCHIVE_ERRORS = (tarfile.TarError, EOFError, zlib.error, OSError)
+
+def unpack(reader, destination):
+    # unpacks into a hidden directory inside destination, whatever goes wrong while reading the stream leaves nothing behind
+    os.makedirs(destination, exist_ok=True)
+    unpackDir = tempfile.mkdtemp(prefix='.unpack-', dir=destination)
+    try:
+        extracted, sha = extract_stream(reader, unpackDir)
+    except BaseException:
+        shutil.rmtree(unpackDir, ignore_errors=True)
+        raise
+    return unpackDir, extracted, sha
+
+def move_extracted(unpackDir, destination, extracted):
+    # the verified entries are renamed into place, so that nobody ever sees a half unpacked tree
+    for entry in extracted:
+        path = os.path.join(destination, entry)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        elif os.path.lexists(path):
+            os.remove(path)
+        os.replace(os.path.join(unpackDir, entry), path)
+    shutil.rmtree(unpackDir, ignore_errors=True)
+
+def staging(installPath):
+    # DESTDIR of an installation, make and cmake put the package into staging(installPath) + installPath
+    return installPath + '.staging'
+
+def relocate(path, oldPrefix, newPrefix):
+    # installed text files (CMake configs, pkg-config files, *-config scripts, libtool archives) contain the install prefix,
+    # binaries are left alone as their strings can't change length
+    for root, dirs, files in os.walk(path):
+        for name in dirs + files:
+            entry = os.path.join(root, name)
+            if os.path.islink(entry):
+                target = os.readlink(entry)
+                if target.startswith(oldPrefix):
+                    os.remove(entry)
+                    os.symlink(newPrefix + target[len(oldPrefix):], entry)
+            elif name in files:
+                with open(entry, 'rb') as f:
+                    content = f.read()
+                if b'\0' in content[:8192] or oldPrefix.encode() not in content:
+                    continue
+                with open(entry, 'wb') as f:
+                    f.write(content.replace(oldPrefix.encode(), newPrefix.encode()))
+
+# optimisation flags of the build profiles, applied to FlexibleSUSY and to the dependencies compiled from source;
+# pgo additionally builds FlexibleSUSY instrumented, trains it on the example inputs of the models and rebuilds it with the profile
+BUILD_PROFILES = {
+    'debug': '-O0 -g',
+    'release': '-O2',
+    'native': '-O3 -march=native',
+    'lto': '-O3 -march=native -flto',
+    'pgo': '-O3 -march=native',
+}
+
+def native_cpu():
+    # -march=native builds only run on the CPU they were built on
+    if os.path.exists('/proc/cpuinfo'):
+        with open('/proc/cpuinfo', 'r') as f:
+            match = re.search(r'^model name\s*:\s*(.*)$', f.read(), re.MULTILINE)
+            if match:
+                return match.group(1)
+    return platform.processor()
+
+def requires(*dependencies):
+    # names of the packages that have to be installed before the decorated installer can run
+    def decorator(installer):
+        installer.requires = dependencies
+        return installer
+    return decorator
+
+def download_only(installer):
+    # the decorated installer only downloads, it doesn't take a share of the jobs
+    installer.downloadOnly = True
+    return installer
+
+def run_graph(nodes, jobs):
+    # nodes maps a package name to (installer, installerArgs), the dependencies are taken from
+    # the @requires of the installer and only count if that package is installed in this run too
+    deps = {name: [d for d in getattr(installer, 'requires', ()) if d in nodes] for name, (installer, _) in nodes.items()}
+    dependents = {name: [n for n in nodes if name in deps[n]] for name in nodes}
+    def height(name):
+        return 1 + max((height(d) for d in dependents[name]), default=0)
+    priority = {name: height(name) for name in nodes}
+
+    pending = dict(nodes)
+    done = set()
+    running = {}
+    failure = None
+    downloads = [name for name, (installer, _) in nodes.items() if getattr(installer, 'downloadOnly', False)]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, jobs) + len(downloads)) as pool:
+        while pending or running:
+            ready = [name for name in pending if all(d in done for d in deps[name])]
+            # downloads start as soon as they are ready, they leave all jobs to the builds
+            for name in [n for n in ready if n in downloads and failure is None]:
+                ready.remove(name)
+                installer, installerArgs = pending.pop(name)
+                running[name] = (pool.submit(installer, *installerArgs, jobs=1), 0)
+            # start the nodes on the longest chain first, they determine the total run time
+            ready.sort(key=lambda name: priority[name], reverse=True)
+            free = jobs - sum(share for _, share in running.values())
+            while ready and free > 0 and failure is None:
+                name = ready.pop(0)
+                share = max(1, -(-free // (len(ready) + 1)))
+                free -= share
+                installer, installerArgs = pending.pop(name)
+                running[name] = (pool.submit(installer, *installerArgs, jobs=share), share)
+            if not running:
+                if failure is None and pending:
+                    failure = RuntimeError(f'unresolvable dependencies between {", ".join(pending)}')
+                break
+            finished, _ = concurrent.futures.wait([f for f, _ in running.values()], return_when=concurrent.futures.FIRST_COMPLETED)
+            for name in [n for n, (f, _) in running.items() if f in finished]:
+                future, _ = running.pop(name)
+                if future.exception() is not None:
+                    failure = failure or future.exception()
+                else:
+                    done.add(name)
+    if failure is not None:
+        raise failure
+
+def flexiblesusy_flags(flags, pgoFlags=''):
+    # the profile guided optimisation flags only go to the C++ compiler and the linker, the Fortran compiler may be a different one
+    cxxFlags = f'{flags} -fPIC {pgoFlags}'.strip()
+    return ' '.join(shlex.quote(option) for option in [f'--with-cxxflags={cxxFlags}', f'--with-fflags={flags} -fPIC'.strip(), f'--with-ldflags={cxxFlags}'])
+
+def model_hash(fsInstallPath, model):
+    # hash of the FlexibleSUSY model files and the SARAH model files of the model
+    sha = hashlib.sha256()
+    for directory in [os.path.join(fsInstallPath, 'model_files', model), os.path.join(fsInstallPath, 'sarah', model)]:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                sha.update(os.path.relpath(path, fsInstallPath).encode())
+                with open(path, 'rb') as f:
+                    sha.update(f.read())
+    return sha.hexdigest()
+
+def percentile(values, fraction):
+    # nearest rank
+    values = sorted(values)
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+def run_point(executable, slha):
+    # wall time, success and peak RSS of a single spectrum generator run
+    start = time.perf_counter()
+    process = subprocess.Popen([executable, f'--slha-input-file={slha}'], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    return time.perf_counter() - start, os.waitstatus_to_exitcode(status) == 0, usage.ru_maxrss * 1024
+
+# compiled Boost libraries each package links against, everything else they take from Boost is header-only;
+# FlexibleSUSY itself only needs Boost.Test for its test suite (add 'test' to boostLibraries in config.yml)
+BOOST_LIBRARIES = {
+    'FlexibleSUSY': [],
+    'GM2Calc': [],
+}
+
+# the HiggsBounds and HiggsSignals datasets are git repositories on GitLab. Their files are kept in the dataset store
+# by git blob id (objects/ab/cdef..., executable files as objects/ab/cdef....x) together with the file list of every version (trees/<package>-<version>.json),
+# an install only consists of hard links (or symbolic links across file systems) into the store
+DATASETS = {'HiggsBounds': 'higgsbounds/hbdataset', 'HiggsSignals': 'higgsbounds/hsdataset'}
+GITLAB_API = 'https://gitlab.com/api/v4/projects/'
+
+def blob_sha(content):
+    return hashlib.sha1(b'blob %d\0' % len(content) + content).hexdigest()
+
+# disk space (GB) a package takes while it is built, sources and build tree
+BUILD_SPACE = {
+    'cmake': 0.6, 'Boost': 1.5, 'GSL': 0.2, 'Eigen': 0.1, 'COLLIER': 0.1, 'LoopTools': 0.1,
+    'Himalaya': 0.2, 'HiggsTools': 0.4, 'GM2Calc': 0.1, 'HiggsBounds': 0.3, 'HiggsSignals': 0.3,
+}
+
+def available_memory():
+    return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+
+def in_memory(path):
+    # whether path is on a tmpfs (e.g. /dev/shm), whose files take up memory until they are removed
+    path = os.path.realpath(path)
+    fsType, mountPoint = None, ''
+    try:
+        with open('/proc/mounts', 'r') as f:
+            for line in f:
+                fields = line.split()
+                mount = fields[1].replace('\\040', ' ')
+                if (path == mount or path.startswith(mount.rstrip('/') + '/')) and len(mount) >= len(mountPoint):
+                    fsType, mountPoint = fields[2], mount
+    except OSError:
+        return False
+    return fsType in ['tmpfs', 'ramfs']
+
+def tree_size(path):
+    size = 0
+    for root, dirs, files in os.walk(path):
+        size += sum(os.lstat(os.path.join(root, name)).st_size for name in files)
+    return size
+
+# tools whose location and modification time decide whether the cached toolchain probe is still valid,
+# together with the headers of the system libraries
+PROBE_TOOLS = ['g++', 'clang++', 'gfortran', 'gsl-config', 'cmake']
+PROBE_FILES = ['/etc/os-release'] + [os.path.join(includeDir, header) for includeDir in ['/usr/include', '/usr/local/include'] for header in ['boost/version.hpp', 'eigen3/Eigen/src/Core/util/Macros.h', 'gsl/gsl_version.h']]
+
+def toolchain_fingerprint():
+    fingerprint = {variable: os.environ.get(variable, '') for variable in ['PATH', 'CPATH', 'CPLUS_INCLUDE_PATH']}
+    for tool in PROBE_TOOLS:
+        path = shutil.which(tool)
+        fingerprint[tool] = path and [os.path.realpath(path), os.stat(path).st_mtime]
+    for path in PROBE_FILES:
+        fingerprint[path] = os.stat(path).st_mtime if os.path.exists(path) else None
+    return fingerprint
+
+def first_line(command):
+    result = subprocess.run(command, capture_output=True, text=True)
+    return result.stdout.split('\n')[0].strip() if result.returncode == 0 else None
+
+def header_macros(compiler, source):
+    # the macros defined after preprocessing the source, None if one of its headers isn't found
+    result = subprocess.run([compiler, '-E', '-dM', '-x', 'c++', '-'], input=source, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return dict(re.findall(r'^#define (\w+) (.*)$', result.stdout, re.MULTILINE))
+
+def probe_boost(compiler):
+    with open(os.path.join(resourcePath, 'test', 'boost.cpp'), 'r') as f:
+        macros = header_macros(compiler, f.read())
+    if macros is None or 'BOOST_VERSION' not in macros:
+        return None
+    version = int(macros['BOOST_VERSION'])
+    return f'{version // 100000}.{version // 100 % 1000}.{version % 100}'
+
+def probe_eigen(compiler):
+    macros = header_macros(compiler, '#include <eigen3/Eigen/Core>\n')
+    if macros is None or 'EIGEN_WORLD_VERSION' not in macros:
+        return None
+    return '.'.join(macros[f'EIGEN_{part}_VERSION'] for part in ['WORLD', 'MAJOR', 'MINOR'])
+
+def probe_distro():
+    distroString = ''
+    for release in glob.glob('/etc/*-release'):
+        with open(release, 'r', errors='replace') as f:
+            distroString += f.read()
+    if re.search('ubuntu', distroString, re.IGNORECASE):
+        return 'ubuntu'
+    elif re.search('opensuse', distroString, re.IGNORECASE):
+        return 'opensuse'
+    return 'unknown'
+
+# the last probe of this process, runs into other prefixes don't have to probe again
+lastProbe = None
+
+# optional packages and the question deciding whether they are installed
+COMPONENTS = [
+    ('COLLIER', 'Include Collier?'),
+    ('LoopTools', 'Include LoopTools?'),
+    ('HiggsTools', 'Include HiggsTools?'),
+    ('HiggsBounds', 'Download HiggsBounds database?'),
+    ('HiggsSignals', 'Download HiggsSignals database?'),
+    ('GM2Calc', 'Include GM2Calc?'),
+    ('Himalaya', 'Include Himalaya?'),
+]
+
+class Run:
+    # the state of one plan or installation, runs into different prefixes can go on at the same time. Only what is
+    # worth keeping between the runs of one process (HTTP connections, the last toolchain probe) is shared
+    def __init__(self, options, configuration=None):
+        # options are the parsed command line, configuration replaces the file given with --config
+        self.args = options
+        self.config = load_config(configuration if configuration is not None else self.args.config)
+        # FlexibleSUSY is installed in prefix, its dependencies in depsPath
+        self.prefix = os.path.abspath(self.args.prefix) if self.args.prefix else str(resourcePath)
+        self.depsPath = os.path.join(self.prefix, 'FlexibleSUSY-deps')
+        # sources and build trees of the dependencies, created in the build root once it is known which packages are built
+        self.tmpDir = None
+
+        self.eigenVersion = self.config["versions"]["Eigen"]
+        self.eigenPathInc = os.path.join(self.depsPath, f'eigen-{self.eigenVersion}', 'include', 'eigen3')
+        self.cmakeVersion = self.config["versions"]["cmake"]
+        self.boostVersion = self.config["versions"]["Boost"]
+        self.himalayaVersion = self.config["versions"]["Himalaya"]
+        self.collierVersion = self.config["versions"]["COLLIER"]
+        self.ltVersion = self.config["versions"]["LoopTools"]
+        self.htVersion = self.config["versions"]["HiggsTools"]
+        self.hbVersion = self.config["versions"]["HiggsBounds"]
+        self.hsVersion = self.config["versions"]["HiggsSignals"]
+
+        self.profile = self.config.get('profile') or {}
+        if self.args.profile:
+            with open(self.args.profile, 'r') as file:
+                self.profile = yaml.safe_load(file) or {}
+
+        self.cacheDir = None
+        if not self.args.no_cache:
+            self.cacheDir = self.args.cache_dir or os.environ.get('FLEXIBLESUSY_INSTALL_CACHE') or os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.expanduser(os.path.join('~', '.cache'))), 'install-flexiblesusy')
+
+        self.datasetStore = self.args.dataset_store or os.environ.get('FLEXIBLESUSY_DATASET_STORE') or self.config.get('datasetStore') or os.path.join(os.environ.get('XDG_DATA_HOME', os.path.expanduser(os.path.join('~', '.local', 'share'))), 'install-flexiblesusy', 'datasets')
+
+        # FlexibleSUSY-deps/install-journal.json records the answers, the build directory and the completed steps of every package
+        # (fetch including the extraction, configure, build, install) until the run succeeds, --resume continues a failed run from there
+        self.journalPath = os.path.join(self.depsPath, 'install-journal.json')
+        self.journalLock = threading.Lock()
+        self.journal = {'answers': {}, 'steps': {}, 'sources': {}}
+        self.logDir = self.args.log_dir or os.path.join(self.depsPath, 'logs')
+        self.loggers = {}
+        self.loggersLock = threading.Lock()
+        self.report = []
+        self.reportLock = threading.Lock()
+        self.runStart = time.monotonic()
+        self.sourceTrees = {}
+        self.fetchPool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+        self.fetches = {}
+        self.fetchLock = threading.Lock()
+        # FlexibleSUSY-deps/install-state.json records version and build options of every completely installed package,
+        # packages are installed into a staging directory and renamed into place, so that an interrupted installation never counts as done
+        self.statePath = os.path.join(self.depsPath, 'install-state.json')
+        self.stateLock = threading.Lock()
+
+        self.downloadTimeout = float(self.config.get('downloadTimeout') or DOWNLOAD_TIMEOUT)
+        self.downloadRetries = int(self.config.get('downloadRetries') if self.config.get('downloadRetries') is not None else DOWNLOAD_RETRIES)
+
+        self.artifactDir = self.args.artifact_dir or os.environ.get('FLEXIBLESUSY_INSTALL_ARTIFACTS')
+        self.cxx = None
+        self.toolchain = {}
+
+        self.buildProfile = self.args.build_profile or self.config.get('buildProfile')
+        if self.buildProfile is not None and self.buildProfile not in BUILD_PROFILES:
+            raise InstallError(f'Unknown build profile {self.buildProfile} in config.yml, use one of {", ".join(BUILD_PROFILES)}')
+
+        self.launcher = None
+        if self.args.compiler_cache == 'auto':
+            self.launcher = shutil.which('ccache') or shutil.which('sccache')
+        elif self.args.compiler_cache != 'none':
+            self.launcher = shutil.which(self.args.compiler_cache)
+            if self.launcher == None:
+                raise InstallError(f'{self.args.compiler_cache} not found in path')
+
+    def save_journal(self):
+        # json.dump walks the journal while it writes, every change to it (and to sourceTrees) takes journalLock
+        with self.journalLock:
+            os.makedirs(self.depsPath, exist_ok=True)
+            with open(self.journalPath + '.part', 'w') as f:
+                json.dump(self.journal, f, indent=2)
+            os.replace(self.journalPath + '.part', self.journalPath)
+
+    def step_done(self, package, step, command=None):
+        # the steps are recorded with their command, a step whose command changed (other models, flags, ...) isn't done
+        return any(s == step and (command is None or c == command) for s, c in self.journal['steps'].get(package, []))
+
+    def record_step(self, package, step, command=None):
+        with self.journalLock:
+            self.journal['steps'].setdefault(package, []).append([step, command])
+        self.save_journal()
+
+    def forget_step(self, package, step):
+        # the step runs again, and so does everything the package did after it
+        with self.journalLock:
+            steps = self.journal['steps'].get(package, [])
+            done = [s for s, _ in steps]
+            if step not in done:
+                return
+            del steps[done.index(step):]
+        self.save_journal()
+
+    def ask(self, question, answer=None):
+        # answer is the one given by the install profile, None if the profile doesn't answer the question,
+        # a resumed run takes the answers of the run it continues
+        answer = self.journal['answers'].get(question, answer)
+        if answer is None and self.args.yes:
+            answer = True
+        if answer is not None:
+            print(f'{question} [yes/no]: {"yes" if answer else "no"}')
+        else:
+            if self.args.non_interactive:
+                raise InstallError(f'The install profile has no answer to "{question}" and --non-interactive was given')
+            # installers run in worker threads, only one of them may talk to the user at a time
+            with promptLock:
+                while True:
+                    reply = input(f'{question} [yes/no]: ')
+                    if reply != "yes" and reply != "no":
+                        print(f'please type yes or no (you typed {reply})')
+                        continue
+                    answer = reply == "yes"
+                    break
+        with self.journalLock:
+            self.journal['answers'][question] = answer
+        return answer
+
+    def component(self, package):
+        # whether the profile enables an optional package, None if it doesn't say
+        enabled = (self.profile.get('components') or {}).get(package)
+        return None if enabled is None else bool(enabled)
+
+    def reinstall(self, package):
+        # whether an already installed package is installed again, None if the user has to be asked
+        policy = self.profile.get('reinstall') or 'ask'
+        if isinstance(policy, dict):
+            policy = policy.get(package, policy.get('default', 'ask'))
+        if policy not in ['skip', 'rebuild', 'ask']:
+            raise InstallError(f'Unknown reinstall policy {policy} for {package} in the install profile, use skip, rebuild or ask')
+        return {'skip': False, 'rebuild': True}.get(policy)
+
+    def build_from_source(self, package, found):
+        # the system section of the profile says where a system dependency comes from:
+        # system, source (always built by this script) or auto (built from source only if it is missing)
+        source = (self.profile.get('system') or {}).get(package) or 'auto'
+        if source not in ['system', 'source', 'auto']:
+            raise InstallError(f'Unknown source {source} of {package} in the install profile, use system, source or auto')
+        if source == 'source':
+            return True
+        if found:
+            return False
+        if source == 'system':
+            raise InstallError(f'According to the install profile {package} comes from the system, please install it and re-run this script')
+        return self.ask(f'Install {package} from source?')
+
+    def package_jobs(self, package, jobs):
+        # the jobs section of config.yml can fix the number of jobs of a package, e.g. to limit the memory use of its build
+        return int((self.config.get('jobs') or {}).get(package) or jobs)
+
+    def pinned_checksum(self, package, version):
+        checksums = (self.config.get('checksums') or {}).get(package) or {}
+        return {str(v): checksum for v, checksum in checksums.items()}.get(str(version))
+
+    @contextlib.contextmanager
+    def phase(self, package, name, detail=None):
+        # times one phase of the installation of a package, the yielded entry takes further measurements
+        entry = {'package': package, 'phase': name, 'detail': detail, 'thread': threading.current_thread().name, 'start': time.monotonic() - self.runStart}
+        try:
+            yield entry
+        finally:
+            entry['wall'] = time.monotonic() - self.runStart - entry['start']
+            with self.reportLock:
+                self.report.append(entry)
+
+    def package_log(self, package):
+        # each run starts a new log file per package, the logs of earlier runs (and of runs
+        # producing more than LOG_SIZE bytes) are kept as <package>.log.1, .2, ...
+        with self.loggersLock:
+            if package not in self.loggers:
+                os.makedirs(self.logDir, exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(os.path.join(self.logDir, f'{package}.log'), maxBytes=LOG_SIZE, backupCount=LOG_BACKUPS)
+                if os.path.getsize(handler.baseFilename) > 0:
+                    handler.doRollover()
+                handler.setFormatter(logging.Formatter('%(message)s'))
+                # not registered with logging.getLogger, runs at the same time have their own loggers
+                logger = logging.Logger(f'install.{package}')
+                logger.propagate = False
+                logger.setLevel(logging.INFO)
+                logger.addHandler(handler)
+                self.loggers[package] = logger
+            return self.loggers[package]
+
+    def run_step(self, package, phaseName, command, cwd, detail=None):
+        # runs one phase of an installation and stops the installation if it fails, the output
+        # goes line by line to the log of the package so that memory use doesn't grow with it
+        step = f'{phaseName} {detail}' if detail else phaseName
+        if self.step_done(package, step, command):
+            print(f'{package}: {step} was completed by the resumed run')
+            return
+        self.forget_step(package, step)
+        log = self.package_log(package)
+        log.info(f'==> {step}: {command}')
+        tail = collections.deque(maxlen=LOG_TAIL)
+        key = f'{package} {detail}' if detail else package
+        state = {}
+        # only the command line interface puts a status line in place of sys.stdout
+        statusLine = sys.stdout if isinstance(sys.stdout, StatusLine) else None
+        with self.phase(package, phaseName, detail) as entry:
+            process = subprocess.Popen(command, cwd=cwd, shell=True, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            for line in iter(lambda: process.stdout.readline(65536), b''):
+                line = line.decode(errors='replace').rstrip()
+                log.info(line)
+                tail.append(line)
+                if statusLine is not None:
+                    statusLine.update(key, f'{phaseName} {build_progress(line, state)}')
+            process.stdout.close()
+            # unlike wait, wait4 returns the resource usage of the command and all processes it waited for
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            entry['cpu'] = usage.ru_utime + usage.ru_stime
+            entry['peakRSS'] = usage.ru_maxrss * 1024
+        if statusLine is not None:
+            statusLine.done(key)
+        if process.returncode != 0:
+            print('\n'.join(tail))
+            raise InstallError(f'{package} installation failed, see {log.handlers[0].baseFilename} for the full output')
+        self.record_step(package, step, command)
+
+    def write_report(self, path):
+        with open(path, 'w', newline='') as f:
+            if path.endswith('.csv'):
+                writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(self.report)
+            else:
+                json.dump(self.report, f, indent=2)
+
+    def write_trace(self, path):
+        threads = {}
+        events = []
+        for entry in sorted(self.report, key=lambda e: e['start']):
+            name = entry['package'] + ' ' + entry['phase'] + (f' {entry["detail"]}' if entry['detail'] else '')
+            events.append({'name': name, 'cat': entry['phase'], 'ph': 'X', 'pid': os.getpid(), 'tid': threads.setdefault(entry['thread'], len(threads)),
+                           'ts': entry['start'] * 1e6, 'dur': entry['wall'] * 1e6, 'args': {k: entry[k] for k in ['cpu', 'peakRSS', 'bytes', 'source'] if k in entry}})
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def print_summary(self):
+        phases = ['download', 'configure', 'build', 'install']
+        print(f'\n{"package":<14}' + ''.join(f'{p:>11}' for p in phases + ['other', 'total', 'cpu']) + f'{"peak RSS":>11}{"downloaded":>12}')
+        for package in sorted(set(e['package'] for e in self.report)):
+            entries = [e for e in self.report if e['package'] == package]
+            times = [sum(e['wall'] for e in entries if e['phase'] == p) for p in phases]
+            other = sum(e['wall'] for e in entries if e['phase'] not in phases)
+            cpu = sum(e.get('cpu', 0) for e in entries)
+            peakRSS = max(e.get('peakRSS', 0) for e in entries) / 1024**2
+            downloaded = sum(e.get('bytes', 0) for e in entries) / 1024**2
+            print(f'{package:<14}' + ''.join(f'{t:>10.1f}s' for t in times + [other, sum(times) + other, cpu]) + f'{peakRSS:>8.0f} MB{downloaded:>9.1f} MB')
+
+    @contextlib.contextmanager
+    def locked_cache(self):
+        # the cache can be shared between several runs of this script (e.g. on a shared file system)
+        with cacheLock:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            with open(os.path.join(self.cacheDir, '.lock'), 'w') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    indexPath = os.path.join(self.cacheDir, 'index.json')
+                    index = {}
+                    if os.path.exists(indexPath):
+                        with open(indexPath, 'r') as f:
+                            index = json.load(f)
+                    yield index
+                    fd, tmpIndex = tempfile.mkstemp(dir=self.cacheDir)
+                    with os.fdopen(fd, 'w') as f:
+                        json.dump(index, f, indent=2, sort_keys=True)
+                    os.chmod(tmpIndex, 0o644)
+                    os.replace(tmpIndex, indexPath)
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def cached_archive(self, sha):
+        return os.path.join(self.cacheDir, sha[:2], sha)
+
+    def evict_cache(self, index, keep):
+        archives = []
+        for entry in os.scandir(self.cacheDir):
+            if entry.is_dir():
+                archives += [(a.stat().st_mtime, a.stat().st_size, a.path) for a in os.scandir(entry.path) if a.is_file()]
+        size = sum(a[1] for a in archives)
+        for _, archiveSize, path in sorted(archives):
+            if size <= self.args.cache_size * 1024**3:
+                break
+            if path == keep:
+                continue
+            os.remove(path)
+            size -= archiveSize
+            for key in [k for k, sha in index.items() if sha == os.path.basename(path)]:
+                del index[key]
+
+    def source_urls(self, package):
+        # the mirrors of the package listed in config.yml and the URL above
+        version = str(self.config["versions"][package])
+        templates = list((self.config.get('mirrors') or {}).get(package) or []) + [SOURCES[package]]
+        return [t.format(version=version, versionUnderscore=version.replace('.', '_')) for t in templates]
+
+    def download(self, package, destination):
+        with self.phase(package, 'download') as entry:
+            extracted = self.download_sources(package, destination, entry)
+        if destination == self.tmpDir:
+            # sourceTrees is the sources section of the journal, which save_journal may be writing out right now
+            with self.journalLock:
+                self.sourceTrees[package] = [os.path.join(destination, e) for e in extracted]
+            self.record_step(package, 'fetch', str(self.config["versions"][package]))
+
+    def remove_sources(self, package):
+        # the sources and the build tree of a package go as soon as it is installed
+        if package in self.fetches:
+            concurrent.futures.wait([self.fetches[package]])
+        with self.journalLock:
+            trees = self.sourceTrees.pop(package, [])
+        for tree in trees:
+            shutil.rmtree(tree, ignore_errors=True)
+
+    def download_sources(self, package, destination, entry):
+        # streams the source archive of the package (from the cache or the network) straight into destination,
+        # the stream is verified against the checksum pinned in config.yml while it is unpacked
+        version = self.config["versions"][package]
+        checksum = self.pinned_checksum(package, version)
+        key = f'{package}-{version}'
+        if self.cacheDir is not None:
+            with self.locked_cache() as index:
+                sha = checksum or index.get(key)
+                if sha is not None and os.path.exists(self.cached_archive(sha)):
+                    # the modification time marks the last use of the archive
+                    os.utime(self.cached_archive(sha))
+                    index[key] = sha
+            if sha is not None and os.path.exists(self.cached_archive(sha)):
+                entry['source'] = 'cache'
+                streamSha = None
+                try:
+                    with open(self.cached_archive(sha), 'rb') as f:
+                        unpackDir, extracted, streamSha = unpack(HashingReader(f), destination)
+                except ARCHIVE_ERRORS:
+                    pass
+                if streamSha == sha:
+                    move_extracted(unpackDir, destination, extracted)
+                    return extracted
+                print(f'Cached archive of {package} {version} is corrupted, removing it')
+                if streamSha is not None:
+                    shutil.rmtree(unpackDir, ignore_errors=True)
+                os.remove(self.cached_archive(sha))
+        if self.args.offline:
+            raise InstallError(f'{package} {version} is not in the download cache {self.cacheDir} and --offline was given')
+
+        copy = None
+        if self.cacheDir is not None:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            fd, partial = tempfile.mkstemp(dir=self.cacheDir, suffix='.part')
+            copy = os.fdopen(fd, 'wb')
+        stream = MirrorStream(rank_mirrors(self.source_urls(package), self.downloadTimeout), self.downloadTimeout, self.downloadRetries)
+        try:
+            entry['source'] = 'network'
+            reader = HashingReader(stream, copy)
+            unpackDir, extracted, sha = unpack(reader, destination)
+            entry['bytes'] = reader.size
+        except BaseException:
+            if copy is not None:
+                copy.close()
+                os.remove(partial)
+            raise
+        finally:
+            stream.close()
+            if copy is not None:
+                copy.close()
+        url = stream.urls[0]
+        if checksum is not None and sha != checksum:
+            shutil.rmtree(unpackDir, ignore_errors=True)
+            if copy is not None:
+                os.remove(partial)
+            raise InstallError(f'Checksum of {url} does not match: expected {checksum}, got {sha}')
+        if checksum is None:
+            print(f'No checksum of {package} {version} in config.yml, the downloaded archive has sha256 {sha}')
+        move_extracted(unpackDir, destination, extracted)
+        if self.cacheDir is None:
+            return extracted
+        with self.locked_cache() as index:
+            os.makedirs(os.path.dirname(self.cached_archive(sha)), exist_ok=True)
+            os.chmod(partial, 0o644)
+            os.replace(partial, self.cached_archive(sha))
+            index[key] = sha
+            self.evict_cache(index, self.cached_archive(sha))
+        return extracted
+
+    def archive_sha(self, package):
+        # sha256 of the source archive, downloaded without unpacking it
+        stream = MirrorStream(rank_mirrors(self.source_urls(package), self.downloadTimeout), self.downloadTimeout, self.downloadRetries)
+        try:
+            reader = HashingReader(stream)
+            while reader.read(1 << 20):
+                pass
+        finally:
+            stream.close()
+        version = self.config["versions"][package]
+        checksum = self.pinned_checksum(package, version)
+        if checksum is not None and reader.sha.hexdigest() != checksum:
+            raise InstallError(f'Checksum of {stream.urls[0]} does not match: expected {checksum}, got {reader.sha.hexdigest()}')
+        print(f'{package} {version}: {reader.sha.hexdigest()}')
+        return reader.sha.hexdigest()
+
+    def pin_checksums(self):
+        # --pin-checksums: the archives of all versions in config.yml are downloaded and their checksums written into
+        # its checksums section, the rest of the file (comments included) stays as it is
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            shas = dict(zip(SOURCES, pool.map(self.archive_sha, SOURCES)))
+        checksums = self.config.get('checksums') or {}
+        for package, sha in shas.items():
+            checksums[package] = {**{str(v): c for v, c in (checksums.get(package) or {}).items()}, str(self.config["versions"][package]): sha}
+        section = yaml.safe_dump({'checksums': checksums}, default_flow_style=False).splitlines()
+        with open(self.args.config, 'r') as f:
+            lines = f.read().splitlines()
+        start = next((i for i, line in enumerate(lines) if re.match(r'checksums:', line)), None)
+        if start is None:
+            lines += section
+        else:
+            end = start + 1
+            while end < len(lines) and lines[end].startswith((' ', '\t')):
+                end += 1
+            lines[start:end] = section
+        with open(self.args.config + '.part', 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(self.args.config + '.part', self.args.config)
+        print(f'Pinned the checksums of {len(shas)} archives in {self.args.config}')
+
+    def prefetch(self, package, destination=None):
+        # starts fetching the sources in the background, e.g. while the dependencies of the package are being built
+        with self.fetchLock:
+            if package not in self.fetches and self.step_done(package, 'fetch', str(self.config["versions"][package])):
+                # unpacked by the resumed run
+                self.fetches[package] = concurrent.futures.Future()
+                self.fetches[package].set_result(None)
+            if package not in self.fetches:
+                self.fetches[package] = self.fetchPool.submit(self.download, package, destination or self.tmpDir)
+            return self.fetches[package]
+
+    def fetch(self, package, destination=None):
+        self.prefetch(package, destination).result()
+
+    def read_state(self):
+        if not os.path.exists(self.statePath):
+            return {}
+        with open(self.statePath, 'r') as f:
+            return json.load(f)
+
+    def already_installed(self, package, version, options, installPath, question='Do you want to reinstall {package}?'):
+        options = json.loads(json.dumps(options))
+        with self.stateLock:
+            entry = self.read_state().get(package)
+        if entry is not None and entry['complete'] and entry['version'] == str(version) and entry['options'] == options and os.path.isdir(installPath) and self.reinstall(package) is not True:
+            print(f'{package} {version} is already installed in {installPath}')
+            return True
+        if os.path.exists(installPath):
+            print(f'{package} seems to be already installed locally in {installPath}')
+            if not self.ask(question.format(package=package), self.reinstall(package)):
+                return True
+        # leftovers of an interrupted installation, whatever it installed into them has to be installed again
+        shutil.rmtree(staging(installPath), ignore_errors=True)
+        self.forget_step(package, 'install')
+        return False
+
+    def commit_install(self, package, version, options, installPath, stagedPath=None):
+        # swaps the staged package into place and marks it as complete
+        stagedPath = stagedPath or staging(installPath) + installPath
+        if os.path.isdir(stagedPath):
+            if os.path.exists(installPath):
+                os.rename(installPath, installPath + '.old')
+            os.rename(stagedPath, installPath)
+            shutil.rmtree(installPath + '.old', ignore_errors=True)
+        elif not os.path.isdir(installPath):
+            raise InstallError(f'{package} was neither installed into {stagedPath} nor into {installPath}')
+        # else the build system ignored DESTDIR and installed in place
+        shutil.rmtree(staging(installPath), ignore_errors=True)
+        with self.stateLock:
+            state = self.read_state()
+            state[package] = {'version': str(version), 'options': options, 'prefix': installPath, 'complete': True, 'installed': time.strftime('%Y-%m-%dT%H:%M:%S')}
+            os.makedirs(self.depsPath, exist_ok=True)
+            with open(self.statePath + '.part', 'w') as f:
+                json.dump(state, f, indent=2)
+            os.replace(self.statePath + '.part', self.statePath)
+        self.remove_sources(package)
+
+    def compiler_identity(self):
+        # cxx and the compiler versions are set from the toolchain probe
+        return (platform.machine(), self.cxx, self.toolchain.get('cxxVersion'), self.toolchain.get('gfortran'))
+
+    def artifact_path(self, package, version, buildFlags):
+        identity = list(self.compiler_identity())
+        if '-march=native' in json.dumps(buildFlags):
+            identity.append(native_cpu())
+        key = hashlib.sha256(json.dumps([package, str(version), identity, buildFlags]).encode()).hexdigest()
+        return os.path.join(self.artifactDir, f'{package}-{version}-{key[:16]}.tar.gz')
+
+    def unpack_artifact(self, package, version, buildFlags, installPath):
+        if self.artifactDir is None or self.args.artifact_mode == 'write':
+            return False
+        artifact = self.artifact_path(package, version, buildFlags)
+        if not os.path.exists(artifact):
+            return False
+        print(f'Unpacking prebuilt {package} from {artifact}...')
+        with self.phase(package, 'unpack'):
+            with tarfile.open(artifact, 'r:gz') as tar:
+                metadata = json.load(tar.extractfile('.artifact.json'))
+                members = [m for m in tar.getmembers() if m.name != '.artifact.json']
+                # the artifact directory may be shared with other users
+                extract_members(tar, staging(installPath), members)
+            if metadata['prefix'] != installPath:
+                relocate(staging(installPath), metadata['prefix'], installPath)
+        self.commit_install(package, version, buildFlags, installPath, staging(installPath))
+        return True
+
+    def pack_artifact(self, package, version, buildFlags, installPath):
+        if self.artifactDir is None or self.args.artifact_mode == 'read':
+            return
+        artifact = self.artifact_path(package, version, buildFlags)
+        print(f'Packing {package} into {artifact}...')
+        os.makedirs(self.artifactDir, exist_ok=True)
+        fd, tmpArtifact = tempfile.mkstemp(dir=self.artifactDir, suffix='.part')
+        os.close(fd)
+        with self.phase(package, 'pack'):
+            with tarfile.open(tmpArtifact, 'w:gz') as tar:
+                metadata = json.dumps({'package': package, 'version': str(version), 'compiler': self.compiler_identity(), 'flags': buildFlags, 'prefix': installPath}).encode()
+                info = tarfile.TarInfo('.artifact.json')
+                info.size = len(metadata)
+                tar.addfile(info, io.BytesIO(metadata))
+                for entry in sorted(os.listdir(installPath)):
+                    tar.add(os.path.join(installPath, entry), arcname=entry)
+        os.chmod(tmpArtifact, 0o644)
+        os.replace(tmpArtifact, artifact)
+
+    def profile_flags(self):
+        # '' leaves every package with its own default flags
+        flags = BUILD_PROFILES.get(self.buildProfile, '')
+        if self.buildProfile == 'lto' and self.cxx == 'gcc':
+            # static libraries are archived with plain ar, fat objects still contain regular code for it
+            flags += ' -ffat-lto-objects'
+        return flags
+
+    def cmake_profile_flags(self):
+        flags = self.profile_flags()
+        if flags == '':
+            return ''
+        buildType = 'Debug' if self.buildProfile == 'debug' else 'Release'
+        # the flags of the build type replace its defaults (-O3 -DNDEBUG for Release), CMAKE_<LANG>_FLAGS would be put in front of them
+        return f'-DCMAKE_BUILD_TYPE={buildType} ' + ' '.join(shlex.quote(f'-DCMAKE_{language}_FLAGS_{buildType.upper()}={flags}') for language in ['C', 'CXX', 'Fortran'])
+
+    def autotools_profile_flags(self, extraFlags=''):
+        flags = f'{self.profile_flags()} {extraFlags}'.strip()
+        if flags == '':
+            return ''
+        return ' '.join(f'{variable}={shlex.quote(flags)}' for variable in ['CFLAGS', 'CXXFLAGS', 'FFLAGS'])
+
+    def cmake_launcher_flags(self):
+        if self.launcher is None:
+            return ''
+        return f'-DCMAKE_C_COMPILER_LAUNCHER={self.launcher} -DCMAKE_CXX_COMPILER_LAUNCHER={self.launcher}'
+
+    def compilers(self):
+        # C and C++ compiler matching the one found by check_cxx, wrapped by the compiler cache
+        # (neither ccache nor sccache can cache Fortran, so FC is left alone)
+        cc, cxxCompiler = {'clang': ('clang', 'clang++')}.get(self.cxx, ('gcc', 'g++'))
+        if self.launcher is None:
+            return cc, cxxCompiler
+        return f'{self.launcher} {cc}', f'{self.launcher} {cxxCompiler}'
+
+    def compiler_env(self):
+        if self.launcher is None:
+            return ''
+        cc, cxxCompiler = self.compilers()
+        return f'CC={shlex.quote(cc)} CXX={shlex.quote(cxxCompiler)}'
+
+    def compiler_cache_stats(self):
+        # number of cache hits and misses so far, None if they can't be read
+        if self.launcher is None:
+            return None
+        if os.path.basename(self.launcher) == 'sccache':
+            output = subprocess.run([self.launcher, '--show-stats', '--stats-format=json'], capture_output=True, text=True)
+            if output.returncode != 0:
+                return None
+            stats = json.loads(output.stdout)['stats']
+            return sum(stats['cache_hits']['counts'].values()), sum(stats['cache_misses']['counts'].values())
+        output = subprocess.run([self.launcher, '--print-stats'], capture_output=True, text=True)
+        if output.returncode != 0:
+            return None
+        stats = dict(line.split('\t', 1) for line in output.stdout.splitlines() if '\t' in line)
+        hits = sum(int(stats.get(k, 0)) for k in ['direct_cache_hit', 'preprocessed_cache_hit', 'cache_hit_direct', 'cache_hit_cpp'])
+        return hits, int(stats.get('cache_miss', 0))
+
+    def install_cmake(self, jobs=1):
+        installPath = os.path.join(self.depsPath, f'cmake-{self.cmakeVersion}')
+        buildFlags = '-DCMAKE_USE_OPENSSL=OFF'
+        if self.already_installed('cmake', self.cmakeVersion, buildFlags, installPath):
+            return None
+        if self.unpack_artifact('cmake', self.cmakeVersion, buildFlags, installPath):
+            return None
+        print('Installing CMake...')
+        self.fetch('cmake')
+        jobs = self.package_jobs('cmake', jobs)
+        buildDir = os.path.join(self.tmpDir, f'cmake-{self.cmakeVersion}')
+        self.run_step('cmake', 'configure', f'{self.compiler_env()} ./bootstrap --parallel={jobs} --prefix={installPath} -- {buildFlags}', buildDir)
+        self.run_step('cmake', 'build', f'make -j{jobs}', buildDir)
+        self.run_step('cmake', 'install', f'make install DESTDIR={staging(installPath)}', buildDir)
+        self.commit_install('cmake', self.cmakeVersion, buildFlags, installPath)
+        self.pack_artifact('cmake', self.cmakeVersion, buildFlags, installPath)
+
+    def pgo_flags(self, pgoDir):
+        # flags of the instrumented build and flags of the build using the collected profile
+        if self.cxx == 'clang':
+            return f'-fprofile-generate={pgoDir}', f'-fprofile-use={os.path.join(pgoDir, "default.profdata")}'
+        return f'-fprofile-generate={pgoDir}', f'-fprofile-use={pgoDir} -fprofile-correction -Wno-missing-profile'
+
+    def model_inputs(self, fsInstallPath, model, configKey):
+        # the example SLHA inputs FlexibleSUSY creates for the model and the ones listed for it under configKey in config.yml
+        inputs = sorted(glob.glob(os.path.join(fsInstallPath, 'models', model, f'LesHouches.in.{model}*')))
+        return inputs + ((self.config.get(configKey) or {}).get(model) or [])
+
+    def train_models(self, fsInstallPath, models, pgoDir):
+        # the instrumented spectrum generators are run on the example inputs of the models and the inputs listed
+        # under pgoTraining in config.yml, points which don't give a valid spectrum are still useful training
+        for m in models:
+            inputs = self.model_inputs(fsInstallPath, m, 'pgoTraining')
+            with self.phase('FlexibleSUSY', 'train', m):
+                for slha in inputs:
+                    subprocess.run([os.path.join(fsInstallPath, 'models', m, f'run_{m}.x'), f'--slha-input-file={slha}'], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if self.cxx == 'clang':
+            self.run_step('FlexibleSUSY', 'train', f'llvm-profdata merge -output={os.path.join(pgoDir, "default.profdata")} {os.path.join(pgoDir, "*.profraw")}', fsInstallPath)
+
+    def make_targets(self, fsInstallPath, models, fullBuild):
+        if self.args.model_targets:
+            # the library and the spectrum generator of every model are separate goals of a single make, so make's
+            # jobserver schedules all of them at once and a model waiting for its meta code doesn't hold up the others
+            libext = '.a'
+            with open(os.path.join(fsInstallPath, 'config', 'config.mk'), 'r') as f:
+                match = re.search(r'^LIBEXT\s*:?=\s*(\S+)', f.read(), re.MULTILINE)
+                if match:
+                    libext = match.group(1)
+            return ' '.join(f'models/{m}/lib{m}{libext} models/{m}/run_{m}.x' for m in models)
+        elif fullBuild:
+            return ''
+        # the rest of the tree is up to date, only the targets of the new or changed models are built
+        return ' '.join(f'all-{m}' for m in models)
+
+    @requires('cmake', 'boost', 'gsl', 'eigen', 'collier', 'looptools', 'higgstools', 'gm2calc', 'himalaya')
+    def install_flexiblesusy(self, localBoost, localGSL, enableGM2Calc, enableHimalaya, enableCollier, enableLoopTools, enableHiggsTools, jobs=1):
+        fsVersion = self.config["versions"]["FlexibleSUSY"]
+        fsDir = f'FlexibleSUSY-{fsVersion}'
+        # the sources may still be on their way if run_installation started fetching them
+        if 'FlexibleSUSY' in self.fetches or not os.path.exists(os.path.join(self.prefix, fsDir)):
+            self.fetch('FlexibleSUSY', self.prefix)
+        gm2cVersion = self.config["versions"]["GM2Calc"]
+        boostVersion = self.config["versions"]["Boost"]
+
+        gm2Pathlib = ''
+        gm2PathInc = ''
+        if enableGM2Calc:
+            gm2Path = os.path.join(self.depsPath, f'GM2Calc-{gm2cVersion}')
+            if os.path.isdir(os.path.join(gm2Path, 'lib')):
+                gm2Pathlib = os.path.join(gm2Path, 'lib')
+            elif os.path.isdir(os.path.join(gm2Path, 'lib64')):
+                gm2Pathlib = os.path.join(gm2Path, 'lib64')
+            gm2PathInc = '--with-gm2calc-incdir=' + os.path.join(gm2Path, 'include')
+            gm2Pathlib = '--with-gm2calc-libdir=' + gm2Pathlib
+
+        himalayaLibPath = ''
+        himalayaIncPath = ''
+        if enableHimalaya:
+            himalayaPath = os.path.join(self.depsPath, f'Himalaya-{self.himalayaVersion}')
+            if os.path.isdir(os.path.join(himalayaPath, 'lib')):
+                himalayaLibPath = os.path.join(himalayaPath, 'lib')
+            elif os.path.isdir(os.path.join(himalayaPath, 'lib64')):
+                himalayaLibPath = os.path.join(himalayaPath, 'lib64')
+            himalayaIncPath = '--with-himalaya-incdir=' + os.path.join(himalayaPath, 'include')
+            himalayaLibPath = '--with-himalaya-libdir=' + himalayaLibPath
+
+        collierLibPath = ''
+        collierIncPath = ''
+        if enableCollier:
+            collierPath = os.path.join(self.depsPath, f'COLLIER-{self.collierVersion}')
+            if os.path.isdir(os.path.join(collierPath, 'lib')):
+                collierLibPath = os.path.join(collierPath, 'lib')
+            elif os.path.isdir(os.path.join(collierPath, 'lib64')):
+                collierLibPath = os.path.join(collierPath, 'lib64')
+            collierIncPath = '--with-collier-incdir=' + os.path.join(collierPath, 'include')
+            collierLibPath = '--with-collier-libdir=' + collierLibPath
+
+        ltLibPath = ''
+        ltIncPath = ''
+        if enableLoopTools:
+            ltPath = os.path.join(self.depsPath, f'LoopTools-{self.ltVersion}')
+            if os.path.isdir(os.path.join(ltPath, 'lib')):
+                ltLibPath = os.path.join(ltPath, 'lib')
+            elif os.path.isdir(os.path.join(ltPath, 'lib64')):
+                ltLibPath = os.path.join(ltPath, 'lib64')
+            ltIncPath = '--with-looptools-incdir=' + os.path.join(ltPath, 'include')
+            ltLibPath = '--with-looptools-libdir=' + ltLibPath
+
+        enableLoopLibs = ''
+        if enableCollier and enableLoopTools:
+            enableLoopLibs = '--with-loop-libraries=collier,looptools'
+        elif enableCollier:
+            enableLoopLibs = '--with-loop-libraries=collier'
+        elif enableLoopTools:
+            enableLoopLibs = '--with-loop-libraries=looptools'
+
+        htLibPath = ''
+        htIncPath = ''
+        if enableHiggsTools:
+            htPath = os.path.join(self.depsPath, f'HiggsTools-{self.htVersion}')
+            if os.path.isdir(os.path.join(htPath, 'lib')):
+                htLibPath = os.path.join(htPath, 'lib')
+            elif os.path.isdir(os.path.join(htPath, 'lib64')):
+                htLibPath = os.path.join(htPath, 'lib64')
+            htIncPath = '--with-higgstools-incdir=' + os.path.join(htPath, 'include')
+            htLibPath = '--with-higgstools-libdir=' + htLibPath
+
+        boostConfig = ''
+        if localBoost:
+            boostPath = os.path.join(self.depsPath, f'boost-{boostVersion}')
+            boostConfig = '--with-boost-incdir=' + os.path.join(boostPath, 'include')
+            # a header-only Boost has no library directory
+            for libDir in ['lib', 'lib64']:
+                if os.path.isdir(os.path.join(boostPath, libDir)):
+                    boostConfig += ' --with-boost-libdir=' + os.path.join(boostPath, libDir)
+                    break
+
+        gslConfig = ''
+        if localGSL:
+            gslVersion = self.config["versions"]["GSL"]
+            gslConfig = '--with-gsl-config=' + os.path.join(self.depsPath, f'gsl-{gslVersion}', 'bin', 'gsl-config')
+
+        fsInstallPath = os.path.join(self.prefix, f'FlexibleSUSY-{fsVersion}')
+        models = self.args.models.split(',')
+        configureFlags = ' '.join(f'{gm2Pathlib} {gm2PathInc} {himalayaIncPath} {himalayaLibPath} {enableLoopLibs} {collierLibPath} {collierIncPath} {ltIncPath} {ltLibPath} --with-eigen-incdir={self.eigenPathInc} {boostConfig} {gslConfig} {htIncPath} {htLibPath}'.split())
+        if self.launcher is not None:
+            configureFlags += f' --with-cxx={shlex.quote(self.compilers()[1])}'
+        pathFlags = configureFlags
+        pgoDir = os.path.join(fsInstallPath, '.pgo')
+        if self.buildProfile == 'pgo':
+            generateFlags, useFlags = self.pgo_flags(pgoDir)
+            configureFlags += ' ' + flexiblesusy_flags(self.profile_flags(), useFlags)
+        elif self.buildProfile is not None:
+            configureFlags += ' ' + flexiblesusy_flags(self.profile_flags())
+        depVersions = {'Eigen': str(self.eigenVersion)}
+        for package, enabled in [('Boost', localBoost), ('GSL', localGSL), ('GM2Calc', enableGM2Calc), ('Himalaya', enableHimalaya), ('COLLIER', enableCollier), ('LoopTools', enableLoopTools), ('HiggsTools', enableHiggsTools)]:
+            if enabled:
+                depVersions[package] = str(self.config["versions"][package])
+
+        # the stamps record how FlexibleSUSY was configured and how every model was created and built,
+        # only what changed since the last run is redone
+        stampsPath = os.path.join(fsInstallPath, '.install-stamps.json')
+        stamps = {'models': {}}
+        if os.path.exists(stampsPath):
+            with open(stampsPath, 'r') as f:
+                stamps = json.load(f)
+
+        changedModels = []
+        createModels = []
+        for m in models:
+            modelHash = model_hash(fsInstallPath, m)
+            stamp = stamps['models'].get(m, {})
+            if stamp.get('hash') != modelHash or not os.path.isdir(os.path.join(fsInstallPath, 'models', m)):
+                createModels.append(m)
+            elif stamp.get('configure') == configureFlags and stamp.get('deps') == depVersions:
+                print(f'Model {m} is up to date')
+                continue
+            changedModels.append(m)
+        # createmodel of different models doesn't share anything, all models are created at once
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, self.package_jobs("FlexibleSUSY", jobs))) as pool:
+            list(pool.map(lambda m: self.run_step('FlexibleSUSY', 'createmodel', f'./createmodel -f --name={m}', fsInstallPath, detail=m), createModels))
+
+        # make doesn't rebuild objects when only the flags change, objects built with other flags are cleaned first
+        builtWith = stamps.get('configure')
+        fullBuild = builtWith != configureFlags or not os.path.exists(os.path.join(fsInstallPath, 'Makefile'))
+        if self.buildProfile == 'pgo' and changedModels:
+            # the profile covers the whole tree, so a profile guided build always rebuilds everything
+            fullBuild = True
+            changedModels = list(models)
+        if self.buildProfile == 'pgo' and fullBuild:
+            shutil.rmtree(pgoDir, ignore_errors=True)
+            self.run_step('FlexibleSUSY', 'configure', f'./configure --with-models={",".join(models)} {pathFlags} {flexiblesusy_flags(self.profile_flags(), generateFlags)}', fsInstallPath, detail='instrumented')
+            self.run_step('FlexibleSUSY', 'clean', 'make clean', fsInstallPath, detail='instrumented')
+            self.run_step('FlexibleSUSY', 'build', f'make -j{self.package_jobs("FlexibleSUSY", jobs)} {self.make_targets(fsInstallPath, models, True)}', fsInstallPath, detail='instrumented')
+            self.train_models(fsInstallPath, models, pgoDir)
+            builtWith = 'instrumented'
+
+        if fullBuild or stamps.get('withModels') != models:
+            self.run_step('FlexibleSUSY', 'configure', f'./configure --with-models={",".join(models)} {configureFlags}', fsInstallPath)
+            stamps['configure'] = configureFlags
+            stamps['withModels'] = models
+            with open(stampsPath, 'w') as f:
+                json.dump(stamps, f, indent=2)
+
+        # the scan runner finds the spectrum generators relative to its own location
+        shutil.copy(os.path.join(resourcePath, 'scan.py'), fsInstallPath)
+
+        if not fullBuild and not changedModels:
+            print('FlexibleSUSY is up to date')
+            return None
+        if builtWith is not None and builtWith != configureFlags:
+            self.run_step('FlexibleSUSY', 'clean', 'make clean', fsInstallPath)
+        self.run_step('FlexibleSUSY', 'build', f'make -j{self.package_jobs("FlexibleSUSY", jobs)} {self.make_targets(fsInstallPath, models if fullBuild else changedModels, fullBuild)}', fsInstallPath)
+
+        for m in changedModels:
+            stamps['models'][m] = {'hash': model_hash(fsInstallPath, m), 'configure': configureFlags, 'deps': depVersions}
+        with open(stampsPath, 'w') as f:
+            json.dump(stamps, f, indent=2)
+
+    @requires('flexiblesusy')
+    def benchmark_models(self, repeats, jobs=1):
+        # the points run one after the other, so that they don't compete for the CPU and the timings are comparable between installations
+        fsVersion = self.config["versions"]["FlexibleSUSY"]
+        fsInstallPath = os.path.join(self.prefix, f'FlexibleSUSY-{fsVersion}')
+        with open(os.path.join(fsInstallPath, '.install-stamps.json'), 'r') as f:
+            stamps = json.load(f)
+        benchmarksPath = os.path.join(self.depsPath, 'benchmarks.json')
+        benchmarks = []
+        if os.path.exists(benchmarksPath):
+            with open(benchmarksPath, 'r') as f:
+                benchmarks = json.load(f)
+        tolerance = float(self.config.get('benchmarkTolerance') or 0.1)
+        print(f'\n{"model":<14}{"points":>8}{"failed":>8}{"points/s":>10}{"p50":>10}{"p90":>10}{"p99":>10}{"peak RSS":>11}')
+        regressions = []
+        results = []
+        for m in self.args.models.split(','):
+            executable = os.path.join(fsInstallPath, 'models', m, f'run_{m}.x')
+            inputs = self.model_inputs(fsInstallPath, m, 'benchmarkInputs')
+            if not os.path.exists(executable) or not inputs:
+                print(f'{m:<14}  no spectrum generator or no input points to benchmark')
+                continue
+            latencies = []
+            failed = 0
+            peakRSS = 0
+            with self.phase('FlexibleSUSY', 'benchmark', m):
+                for _ in range(repeats):
+                    for slha in inputs:
+                        wall, success, rss = run_point(executable, slha)
+                        latencies.append(wall)
+                        failed += not success
+                        peakRSS = max(peakRSS, rss)
+            result = {
+                'model': m, 'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'key': {'FlexibleSUSY': str(fsVersion), 'deps': stamps['models'].get(m, {}).get('deps'), 'profile': self.buildProfile},
+                'points': len(latencies), 'failed': failed, 'pointsPerSecond': len(latencies) / sum(latencies),
+                'p50': percentile(latencies, 0.5), 'p90': percentile(latencies, 0.9), 'p99': percentile(latencies, 0.99), 'peakRSS': peakRSS,
+            }
+            print(f'{m:<14}{result["points"]:>8}{failed:>8}{result["pointsPerSecond"]:>10.2f}' + ''.join(f'{result[p] * 1000:>8.1f}ms' for p in ['p50', 'p90', 'p99']) + f'{peakRSS / 1024**2:>8.0f} MB')
+            # compared with the last benchmark of the model, whatever changed since then
+            previous = [b for b in benchmarks if b['model'] == m]
+            if previous and result['pointsPerSecond'] < (1 - tolerance) * previous[-1]['pointsPerSecond']:
+                regressions.append((result, previous[-1]))
+            benchmarks.append(result)
+            results.append(result)
+        os.makedirs(self.depsPath, exist_ok=True)
+        with open(benchmarksPath + '.part', 'w') as f:
+            json.dump(benchmarks, f, indent=2)
+        os.replace(benchmarksPath + '.part', benchmarksPath)
+        for result, previous in regressions:
+            change = result['pointsPerSecond'] / previous['pointsPerSecond'] - 1
+            print(f'Regression: {result["model"]} runs {-change:.0%} slower than on {previous["time"]} ({previous["pointsPerSecond"]:.2f} -> {result["pointsPerSecond"]:.2f} points/s)')
+            for field in ['FlexibleSUSY', 'deps', 'profile']:
+                if result['key'][field] != previous['key'][field]:
+                    print(f'  {field}: {previous["key"][field]} -> {result["key"][field]}')
+        for result in results:
+            if result['failed']:
+                print(f'{result["model"]}: {result["failed"]} of {result["points"]} points failed')
+
+    @requires('cmake', 'eigen', 'boost')
+    def install_gm2calc(self, localCMake, localBoost, jobs=1):
+        gm2cVersion = self.config["versions"]["GM2Calc"]
+        installPath = os.path.join(self.depsPath, f'GM2Calc-{gm2cVersion}')
+        buildFlags = f'-DCMAKE_POSITION_INDEPENDENT_CODE=On {self.cmake_profile_flags()}'.strip()
+        # GM2Calc is compiled against the Eigen and Boost headers
+        artifactKey = (buildFlags, f'Eigen-{self.eigenVersion}', f'Boost-{self.boostVersion}' if localBoost else 'Boost-system')
+        if self.already_installed('GM2Calc', gm2cVersion, artifactKey, installPath):
+            return None
+        if self.unpack_artifact('GM2Calc', gm2cVersion, artifactKey, installPath):
+            return None
+        print('Installing GM2Calc...')
+        self.fetch('GM2Calc')
+        os.makedirs(os.path.join(self.tmpDir, f'GM2Calc-{gm2cVersion}', 'build'), exist_ok=True)
+
+        cmakeCMD = 'cmake'
+        if localCMake:
+            cmakeCMD = os.path.join(self.depsPath, f'cmake-{self.cmakeVersion}', 'bin', 'cmake')
+
+        boostFlag = ''
+        if localBoost:
+            boostFlag = '-DBOOST_ROOT=' + os.path.join(self.depsPath, f'boost-{self.boostVersion}')
+
+        buildDir = os.path.join(self.tmpDir, f'GM2Calc-{gm2cVersion}', 'build')
+        self.run_step('GM2Calc', 'configure', f'{cmakeCMD} .. -DCMAKE_INSTALL_PREFIX={installPath} {buildFlags} -DEigen3_DIR={self.eigenPathInc} {boostFlag} {self.cmake_launcher_flags()}', buildDir)
+        self.run_step('GM2Calc', 'build', f'{cmakeCMD} --build . --parallel {self.package_jobs("GM2Calc", jobs)}', buildDir)
+        self.run_step('GM2Calc', 'install', f'DESTDIR={staging(installPath)} {cmakeCMD} --build . --target install', buildDir)
+        self.commit_install('GM2Calc', gm2cVersion, artifactKey, installPath)
+        self.pack_artifact('GM2Calc', gm2cVersion, artifactKey, installPath)
+
+    @requires('cmake')
+    def install_eigen(self, localCMake, jobs=1):
+        eigenVersion = self.config["versions"]["Eigen"]
+        installPath = os.path.join(self.depsPath, f'eigen-{eigenVersion}')
+        if self.already_installed('Eigen', eigenVersion, '', installPath):
+            return None
+        if self.unpack_artifact('Eigen', eigenVersion, '', installPath):
+            return None
+        print('Installing Eigen...')
+        self.fetch('Eigen')
+        os.makedirs(os.path.join(self.tmpDir, f'eigen-{eigenVersion}', 'build'), exist_ok=True)
+
+        cmakeCMD = 'cmake'
+        if localCMake:
+            cmakeCMD = os.path.join(self.depsPath, f'cmake-{self.cmakeVersion}', 'bin', 'cmake')
+
+        buildDir = os.path.join(self.tmpDir, f'eigen-{eigenVersion}', 'build')
+        self.run_step('Eigen', 'configure', f'{cmakeCMD} .. -DCMAKE_INSTALL_PREFIX={installPath} {self.cmake_launcher_flags()}', buildDir)
+        self.run_step('Eigen', 'build', f'{cmakeCMD} --build . --parallel {self.package_jobs("Eigen", jobs)}', buildDir)
+        self.run_step('Eigen', 'install', f'DESTDIR={staging(installPath)} {cmakeCMD} --build . --target install', buildDir)
+        self.commit_install('Eigen', eigenVersion, '', installPath)
+        self.pack_artifact('Eigen', eigenVersion, '', installPath)
+
+    def boost_libraries(self, packages):
+        libraries = set(self.config.get('boostLibraries') or [])
+        for package in packages:
+            libraries.update(BOOST_LIBRARIES.get(package, []))
+        return sorted(libraries)
+
+    def install_boost(self, libraries, jobs=1):
+        installPath = os.path.join(self.depsPath, f'boost-{self.boostVersion}')
+        # only the requested libraries are built, in a single variant
+        b2Flags = ' '.join(f'--with-{library}' for library in libraries) + f' variant={"debug" if self.buildProfile == "debug" else "release"} link=shared threading=multi runtime-link=shared'
+        if self.profile_flags() != '':
+            b2Flags += f' cxxflags={shlex.quote(self.profile_flags())}'
+        if self.already_installed('Boost', self.boostVersion, b2Flags if libraries else 'headers', installPath):
+            return None
+        if self.unpack_artifact('Boost', self.boostVersion, b2Flags if libraries else 'headers', installPath):
+            return None
+        print('Installing Boost...')
+        boostVersionDash = "_".join(self.boostVersion.split("."))
+        self.fetch('Boost')
+        buildDir = os.path.join(self.tmpDir, f'boost_{boostVersionDash}')
+        if libraries:
+            self.run_step('Boost', 'configure', f'./bootstrap.sh --with-libraries={",".join(libraries)}', buildDir)
+            self.run_step('Boost', 'build', f'./b2 -j{self.package_jobs("Boost", jobs)} {b2Flags}', buildDir)
+            self.run_step('Boost', 'install', f'./b2 -j{self.package_jobs("Boost", jobs)} {b2Flags} install --prefix={staging(installPath)}', buildDir)
+        else:
+            # nothing has to be compiled, the release tarball already contains the complete headers
+            with self.phase('Boost', 'install'):
+                shutil.copytree(os.path.join(buildDir, 'boost'), os.path.join(staging(installPath), 'include', 'boost'), symlinks=True)
+        # b2 has no DESTDIR, Boost is installed with the staging directory as prefix
+        self.commit_install('Boost', self.boostVersion, b2Flags if libraries else 'headers', installPath, staging(installPath))
+        self.pack_artifact('Boost', self.boostVersion, b2Flags if libraries else 'headers', installPath)
+
+    def install_gsl(self, jobs=1):
+        gslVersion = self.config["versions"]["GSL"]
+        installPath = os.path.join(self.depsPath, f'gsl-{gslVersion}')
+        buildFlags = self.autotools_profile_flags()
+        if self.already_installed('GSL', gslVersion, buildFlags, installPath):
+            return None
+        if self.unpack_artifact('GSL', gslVersion, buildFlags, installPath):
+            return None
+        print('Installing GSL...')
+        self.fetch('GSL')
+        buildDir = os.path.join(self.tmpDir, f'gsl-{gslVersion}')
+        self.run_step('GSL', 'configure', f'{buildFlags} {self.compiler_env()} ./configure --prefix={installPath}', buildDir)
+        self.run_step('GSL', 'build', f'make -j{self.package_jobs("GSL", jobs)}', buildDir)
+        self.run_step('GSL', 'install', f'make install DESTDIR={staging(installPath)}', buildDir)
+        self.commit_install('GSL', gslVersion, buildFlags, installPath)
+        self.pack_artifact('GSL', gslVersion, buildFlags, installPath)
+
+    @requires('cmake')
+    def install_collier(self, localCMake, jobs=1):
+        installPath = os.path.join(self.depsPath, f'COLLIER-{self.collierVersion}')
+        buildFlags = f'-Dstatic=ON -DCMAKE_POSITION_INDEPENDENT_CODE=ON {self.cmake_profile_flags()}'.strip()
+        if self.already_installed('COLLIER', self.collierVersion, buildFlags, installPath):
+            return None
+        if self.unpack_artifact('COLLIER', self.collierVersion, buildFlags, installPath):
+            return None
+        print('Installing Collier...')
+        self.fetch('COLLIER')
+        buildPath = os.path.join(self.tmpDir, f'COLLIER-{self.collierVersion}', 'build')
+        if not os.path.exists(buildPath):
+            os.makedirs(buildPath)
+
+        cmakeCMD = 'cmake'
+        if localCMake:
+            cmakeCMD = os.path.join(self.depsPath, f'cmake-{self.cmakeVersion}', 'bin', 'cmake')
+
+        buildDir = os.path.join(self.tmpDir, f'COLLIER-{self.collierVersion}', 'build')
+        self.run_step('COLLIER', 'configure', f'{cmakeCMD} .. -DCMAKE_INSTALL_PREFIX={installPath} {buildFlags} {self.cmake_launcher_flags()}', buildDir)
+        self.run_step('COLLIER', 'build', f'{cmakeCMD} --build . --parallel {self.package_jobs("COLLIER", jobs)}', buildDir)
+        self.run_step('COLLIER', 'install', f'DESTDIR={staging(installPath)} {cmakeCMD} --build . --target install', buildDir)
+        self.commit_install('COLLIER', self.collierVersion, buildFlags, installPath)
+        self.pack_artifact('COLLIER', self.collierVersion, buildFlags, installPath)
+
+    def install_looptools(self, jobs=1):
+        installPath = os.path.join(self.depsPath, f'LoopTools-{self.ltVersion}')
+        buildFlags = 'CFLAGS="-O3 -fPIC" CXXFLAGS="-O3 -fPIC" FFLAGS="-O3 -fPIC"'
+        if self.buildProfile is not None:
+            buildFlags = self.autotools_profile_flags('-fPIC')
+        if self.already_installed('LoopTools', self.ltVersion, buildFlags, installPath):
+            return None
+        if self.unpack_artifact('LoopTools', self.ltVersion, buildFlags, installPath):
+            return None
+        print('Installing LoopTools...')
+        self.fetch('LoopTools')
+
+        buildDir = os.path.join(self.tmpDir, f'LoopTools-{self.ltVersion}')
+        self.run_step('LoopTools', 'configure', f'{buildFlags} {self.compiler_env()} ./configure --prefix={installPath}', buildDir)
+        self.run_step('LoopTools', 'build', f'make -j{self.package_jobs("LoopTools", jobs)}', buildDir)
+        self.run_step('LoopTools', 'install', f'make install DESTDIR={staging(installPath)}', buildDir)
+        self.commit_install('LoopTools', self.ltVersion, buildFlags, installPath)
+        self.pack_artifact('LoopTools', self.ltVersion, buildFlags, installPath)
+
+    @requires('cmake', 'eigen')
+    def install_himalaya(self, localCMake, jobs=1):
+        installPath = os.path.join(self.depsPath, f'Himalaya-{self.himalayaVersion}')
+        buildFlags = self.cmake_profile_flags()
+        # Himalaya is compiled against the Eigen headers
+        artifactKey = f'Eigen-{self.eigenVersion} {buildFlags}'.strip()
+        if self.already_installed('Himalaya', self.himalayaVersion, artifactKey, installPath):
+            return None
+        if self.unpack_artifact('Himalaya', self.himalayaVersion, artifactKey, installPath):
+            return None
+        print('Installing Himalaya...')
+        self.fetch('Himalaya')
+        os.makedirs(os.path.join(self.tmpDir, f'Himalaya-{self.himalayaVersion}', 'build'), exist_ok=True)
+
+        cmakeCMD = 'cmake'
+        if localCMake:
+            cmakeCMD = os.path.join(self.depsPath, f'cmake-{self.cmakeVersion}', 'bin', 'cmake')
+
+        buildDir = os.path.join(self.tmpDir, f'Himalaya-{self.himalayaVersion}', 'build')
+        self.run_step('Himalaya', 'configure', f'{cmakeCMD} .. -DCMAKE_INSTALL_PREFIX={installPath} -DEigen3_DIR={self.eigenPathInc} {buildFlags} {self.cmake_launcher_flags()}', buildDir)
+        self.run_step('Himalaya', 'build', f'{cmakeCMD} --build . --parallel {self.package_jobs("Himalaya", jobs)}', buildDir)
+        self.run_step('Himalaya', 'install', f'DESTDIR={staging(installPath)} {cmakeCMD} --build . --target install', buildDir)
+        self.commit_install('Himalaya', self.himalayaVersion, artifactKey, installPath)
+        self.pack_artifact('Himalaya', self.himalayaVersion, artifactKey, installPath)
+
+    def store_object(self, sha, mode):
+        # the linked files share the mode of their object, so executables are kept apart
+        return os.path.join(self.datasetStore, 'objects', sha[:2], sha[2:] + ('.x' if mode == '100755' else ''))
+
+    def add_object(self, content, sha, mode):
+        # the objects are read-only, as every install links to them
+        path = self.store_object(sha, mode)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmpObject = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.chmod(tmpObject, 0o555 if mode == '100755' else 0o444)
+            os.replace(tmpObject, path)
+
+    def save_tree(self, package, version, tree):
+        treePath = os.path.join(self.datasetStore, 'trees', f'{package}-{version}.json')
+        os.makedirs(os.path.dirname(treePath), exist_ok=True)
+        fd, tmpTree = tempfile.mkstemp(dir=os.path.dirname(treePath))
+        with os.fdopen(fd, 'w') as f:
+            json.dump(tree, f, indent=2, sort_keys=True)
+        os.chmod(tmpTree, 0o644)
+        os.replace(tmpTree, treePath)
+
+    def dataset_tree(self, package, version):
+        # path -> [blob id, mode] of every file of the dataset version, None if the file list can't be had
+        treePath = os.path.join(self.datasetStore, 'trees', f'{package}-{version}.json')
+        if os.path.exists(treePath):
+            with open(treePath, 'r') as f:
+                return json.load(f)
+        if self.args.offline:
+            return None
+        tree = {}
+        url = f'{GITLAB_API}{urllib.parse.quote(DATASETS[package], safe="")}/repository/tree?ref=v{version}&recursive=true&per_page=100&pagination=keyset'
+        try:
+            while url:
+                body, headers = http_get(url, self.downloadTimeout, self.downloadRetries)
+                for entry in json.loads(body):
+                    if entry['type'] == 'blob':
+                        tree[entry['path']] = [entry['id'], entry['mode']]
+                link = re.search(r'<([^>]+)>;\s*rel="next"', headers.get('Link') or '')
+                url = link.group(1) if link else None
+        except (OSError, http.client.HTTPException) as error:
+            print(f'Could not list the files of {package} {version} ({error}), downloading the whole archive instead')
+            return None
+        return tree
+
+    def fetch_object(self, package, sha, mode):
+        url = f'{GITLAB_API}{urllib.parse.quote(DATASETS[package], safe="")}/repository/blobs/{sha}/raw'
+        content, _ = http_get(url, self.downloadTimeout, self.downloadRetries)
+        if blob_sha(content) != sha:
+            raise InstallError(f'{url} does not have the expected content')
+        self.add_object(content, sha, mode)
+        return len(content)
+
+    def ingest(self, directory):
+        # adds the files of an unpacked dataset archive to the store and returns their tree
+        tree = {}
+        for root, dirs, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if os.path.islink(path):
+                    content, mode = os.readlink(path).encode(), '120000'
+                else:
+                    with open(path, 'rb') as f:
+                        content = f.read()
+                    mode = '100755' if os.access(path, os.X_OK) else '100644'
+                sha = blob_sha(content)
+                self.add_object(content, sha, mode)
+                tree[os.path.relpath(path, directory)] = [sha, mode]
+        return tree
+
+    def link_tree(self, tree, destination):
+        for path, (sha, mode) in tree.items():
+            target = os.path.join(destination, path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if mode == '120000':
+                with open(self.store_object(sha, mode), 'r') as f:
+                    os.symlink(f.read(), target)
+                continue
+            try:
+                os.link(self.store_object(sha, mode), target)
+            except OSError:
+                # the store is on another file system or doesn't allow hard links
+                os.symlink(self.store_object(sha, mode), target)
+        # the file list of the dataset, so that nothing has to scan the directories to find out what is in there
+        index = {'files': {path: {'sha': sha, 'size': os.path.getsize(self.store_object(sha, mode))} for path, (sha, mode) in tree.items()}, 'directories': {}}
+        for path in sorted(tree):
+            index['directories'].setdefault(os.path.dirname(path), []).append(os.path.basename(path))
+        with open(os.path.join(destination, '.dataset-index.json'), 'w') as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+
+    def install_dataset(self, package, version):
+        installPath = os.path.join(self.depsPath, f'{DATASETS[package].split("/")[1]}-v{version}')
+        if self.already_installed(package, version, '', installPath, 'Do you want to redownload {package}?'):
+            return None
+        print(f'Downloading {package}...')
+        try:
+            os.makedirs(os.path.join(self.datasetStore, 'objects'), exist_ok=True)
+            writable = os.access(os.path.join(self.datasetStore, 'objects'), os.W_OK)
+        except OSError:
+            writable = False
+        with self.phase(package, 'download') as entry:
+            # a store without any version of the dataset gets the archive, a single download instead of one API request per file
+            tree = None
+            if glob.glob(os.path.join(self.datasetStore, 'trees', f'{package}-*.json')):
+                tree = self.dataset_tree(package, version)
+            if tree is not None:
+                # only the files which no other version in the store has are downloaded
+                missing = sorted(set((sha, mode) for sha, mode in tree.values() if not os.path.exists(self.store_object(sha, mode))))
+                if missing and not writable:
+                    print(f'The dataset store {self.datasetStore} is read-only and misses {len(missing)} files of {package} {version}')
+                    tree = None
+                elif 2 * len(missing) > len(tree):
+                    print(f'The dataset store {self.datasetStore} misses {len(missing)} of {len(tree)} files of {package} {version}, downloading the whole archive')
+                    tree = None
+                elif missing:
+                    print(f'Downloading {len(missing)} of {len(tree)} files of {package} {version} into {self.datasetStore}')
+                    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+                        entry['bytes'] = sum(pool.map(lambda object: self.fetch_object(package, *object), missing))
+                if tree is not None and writable:
+                    self.save_tree(package, version, tree)
+        if tree is None:
+            self.fetch(package)
+            extracted = os.path.join(self.tmpDir, os.path.basename(installPath))
+            if not writable:
+                shutil.move(extracted, staging(installPath))
+                self.commit_install(package, version, '', installPath, staging(installPath))
+                return None
+            tree = self.ingest(extracted)
+            self.save_tree(package, version, tree)
+            shutil.rmtree(extracted)
+        with self.phase(package, 'install'):
+            self.link_tree(tree, staging(installPath))
+        self.commit_install(package, version, '', installPath, staging(installPath))
+
+    @download_only
+    def download_hbdb(self, jobs=1):
+        self.install_dataset('HiggsBounds', self.hbVersion)
+
+    @download_only
+    def download_hsdb(self, jobs=1):
+        self.install_dataset('HiggsSignals', self.hsVersion)
+
+    @requires('cmake')
+    def install_higgstools(self, localCMake, jobs=1):
+        installPath = os.path.join(self.depsPath, f'HiggsTools-{self.htVersion}')
+        buildFlags = self.cmake_profile_flags()
+        if self.already_installed('HiggsTools', self.htVersion, buildFlags, installPath):
+            return None
+        if self.unpack_artifact('HiggsTools', self.htVersion, buildFlags, installPath):
+            return None
+        print('Installing HiggsTools...')
+        self.fetch('HiggsTools')
+        os.makedirs(os.path.join(self.tmpDir, f'higgstools-v{self.htVersion}', 'build'), exist_ok=True)
+
+        cmakeCMD = 'cmake'
+        if localCMake:
+            cmakeCMD = os.path.join(self.depsPath, f'cmake-{self.cmakeVersion}', 'bin', 'cmake')
+
+        buildDir = os.path.join(self.tmpDir, f'higgstools-v{self.htVersion}', 'build')
+        self.run_step('HiggsTools', 'configure', f'{cmakeCMD} .. -DCMAKE_INSTALL_PREFIX={installPath} {buildFlags} {self.cmake_launcher_flags()}', buildDir)
+        self.run_step('HiggsTools', 'build', f'{cmakeCMD} --build . --parallel {self.package_jobs("HiggsTools", jobs)}', buildDir)
+        self.run_step('HiggsTools', 'install', f'DESTDIR={staging(installPath)} {cmakeCMD} --build . --target install', buildDir)
+        self.commit_install('HiggsTools', self.htVersion, buildFlags, installPath)
+        self.pack_artifact('HiggsTools', self.htVersion, buildFlags, installPath)
+
+    def build_root(self, packages, jobs):
+        # the first of the candidate directories with room for all packages, a tmpfs also has to leave the compilers
+        # about 1 GB of memory per job
+        needed = sum(BUILD_SPACE.get(p, 0.5) for p in packages) * 1024**3
+        roots = self.args.build_root or os.environ.get('FLEXIBLESUSY_BUILD_ROOT') or self.config.get('buildRoot') or os.pathsep.join(['/dev/shm', tempfile.gettempdir()])
+        candidates = [r for r in roots.split(os.pathsep) if r]
+        for root in candidates:
+            if not os.path.isdir(root) or not os.access(root, os.W_OK):
+                continue
+            free = shutil.disk_usage(root).free
+            if root.startswith('/dev/shm'):
+                free = min(free, available_memory() - jobs * 1024**3)
+            if free >= needed:
+                return root
+        print(f'None of {", ".join(candidates)} has the {needed / 1024**3:.1f} GB needed to build {", ".join(packages)}')
+        if not self.ask(f'Build in {candidates[-1]} anyway?'):
+            raise InstallError(f'Not enough space to build in {", ".join(candidates)}')
+        return candidates[-1]
+
+    def save_probe(self, probePath, probe):
+        os.makedirs(self.depsPath, exist_ok=True)
+        with open(probePath + '.part', 'w') as f:
+            json.dump(probe, f, indent=2)
+        os.replace(probePath + '.part', probePath)
+
+    def probe_toolchain(self):
+        # everything the script needs to know about the system, the detections run concurrently and the
+        # result is kept in FlexibleSUSY-deps until the fingerprint of the toolchain changes
+        global lastProbe
+        probePath = os.path.join(self.depsPath, 'toolchain.json')
+        fingerprint = toolchain_fingerprint()
+        if not self.args.reprobe and os.path.exists(probePath):
+            with open(probePath, 'r') as f:
+                cached = json.load(f)
+            if cached.get('fingerprint') == fingerprint:
+                lastProbe = cached
+                return cached['toolchain'], True
+        if not self.args.reprobe and lastProbe is not None and lastProbe['fingerprint'] == fingerprint:
+            self.save_probe(probePath, lastProbe)
+            return lastProbe['toolchain'], True
+        result = {}
+        if shutil.which('g++'):
+            result['cxx'] = 'gcc'
+            compiler = 'g++'
+        elif shutil.which('clang++'):
+            result['cxx'] = 'clang'
+            compiler = 'clang++'
+        else:
+            result['cxx'] = None
+            compiler = None
+        detections = {
+            'distro': (probe_distro, ()),
+            'gfortran': (first_line, (['gfortran', '--version'],)),
+            'gsl': (first_line, (['gsl-config', '--version'],)),
+            'cmake': (first_line, (['cmake', '--version'],)),
+        }
+        if compiler is not None:
+            detections['cxxVersion'] = (first_line, ([compiler, '--version'],))
+            detections['boost'] = (probe_boost, (compiler,))
+            detections['eigen'] = (probe_eigen, (compiler,))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(detections)) as pool:
+            futures = {name: pool.submit(detection, *detectionArgs) for name, (detection, detectionArgs) in detections.items()}
+            for name, future in futures.items():
+                try:
+                    result[name] = future.result()
+                except OSError:
+                    # the tool isn't installed
+                    result[name] = None
+        if result['cmake'] is not None:
+            result['cmake'] = result['cmake'].split()[-1]
+        lastProbe = {'fingerprint': fingerprint, 'toolchain': result}
+        self.save_probe(probePath, lastProbe)
+        return result, False
+
+    def check_toolchain(self, verbose=True):
+        # the toolchain is probed (or taken from the cached probe) before anything else, without a C++ compiler nothing can be built
+        os.makedirs(self.depsPath, exist_ok=True)
+        self.toolchain, cached = self.probe_toolchain()
+        self.cxx = self.toolchain['cxx']
+        if verbose:
+            print('Checking toolchain' + (' (cached, use --reprobe to detect again)' if cached else ''))
+            for name, key in [('C++ compiler', 'cxxVersion'), ('Fortran compiler', 'gfortran'), ('GSL', 'gsl'), ('Boost', 'boost'), ('Eigen', 'eigen'), ('cmake', 'cmake')]:
+                print(f'  {name}: {self.toolchain.get(key) or "not found"}')
+        if self.cxx == None:
+            message = '\nThis script requires at least a C++ compiler\n'
+            if self.toolchain['distro'] == 'ubuntu':
+                message += 'You seem to be on Ubuntu. You can try running sudo apt install g++\n'
+            elif self.toolchain['distro'] == 'opensuse':
+                message += 'You seem to be on openSUSE. You can try running sudo zypper in gcc-c++\n'
+            raise InstallError(message + '\nPlease install the compiler using your linux distribution package manager and re-run this script')
+        return self.toolchain
+
+    def decide(self):
+        # all questions are asked up front, returns the system dependencies built from source and the optional packages installed
+        fromSource = []
+        foundGSL = self.toolchain['gsl'] != None
+        if not foundGSL:
+            print("FlexibleSUSY requires a GNU scientific library which doesn't seem to be installed on this system")
+            print("We recommend you install it using your linux disctibution package manager or I can try installing it from source")
+        if self.build_from_source('GSL', foundGSL):
+            fromSource.append('GSL')
+
+        foundBoost = self.toolchain['boost'] != None
+        if not foundBoost:
+            print("FlexibleSUSY and some of the dependencies require boost which doesn't seem to be installed on this system")
+            print("We recommend you install it using your linux disctibution package manager or I can try installing it from source")
+        if self.build_from_source('Boost', foundBoost):
+            fromSource.append('Boost')
+
+        foundCMake = self.toolchain['cmake'] != None
+        if not foundCMake:
+            print('cmake not found in path')
+            print(QUESTION)
+        if self.build_from_source('cmake', foundCMake):
+            fromSource.append('cmake')
+
+        components = [package for package, question in COMPONENTS if self.ask(question, self.component(package))]
+        if ('COLLIER' in components or 'LoopTools' in components) and self.toolchain['gfortran'] == None:
+            print('COLLIER and LoopTools require a Fortran compiler but gfortran was not found, their installation will fail')
+        return fromSource, components
+
+    def install_graph(self, fromSource, components):
+        # the installers of a run, (installer, installerArgs) by package, run_graph takes care of the order
+        localGSL, localBoost, localCMake = ['GSL' in fromSource, 'Boost' in fromSource, 'cmake' in fromSource]
+        enableCollier, enableLoopTools, enableHiggsTools, enableGM2Calc, enableHimalaya = [p in components for p in ['COLLIER', 'LoopTools', 'HiggsTools', 'GM2Calc', 'Himalaya']]
+        nodes = {}
+        if localGSL:
+            nodes['gsl'] = (self.install_gsl, ())
+        if localCMake:
+            nodes['cmake'] = (self.install_cmake, ())
+        nodes['eigen'] = (self.install_eigen, (localCMake,))
+        if enableCollier:
+            nodes['collier'] = (self.install_collier, (localCMake,))
+        if enableLoopTools:
+            nodes['looptools'] = (self.install_looptools, ())
+        if enableHiggsTools:
+            nodes['higgstools'] = (self.install_higgstools, (localCMake,))
+        if 'HiggsBounds' in components:
+            nodes['hbdataset'] = (self.download_hbdb, ())
+        if 'HiggsSignals' in components:
+            nodes['hsdataset'] = (self.download_hsdb, ())
+        if enableGM2Calc:
+            nodes['gm2calc'] = (self.install_gm2calc, (localCMake, localBoost))
+        if enableHimalaya:
+            nodes['himalaya'] = (self.install_himalaya, (localCMake,))
+        if localBoost:
+            nodes['boost'] = (self.install_boost, (self.boost_libraries(['FlexibleSUSY'] + (['GM2Calc'] if enableGM2Calc else [])),))
+        nodes['flexiblesusy'] = (self.install_flexiblesusy, (localBoost, localGSL, enableGM2Calc, enableHimalaya, enableCollier, enableLoopTools, enableHiggsTools))
+        if self.args.benchmark:
+            nodes['benchmark'] = (self.benchmark_models, (self.args.benchmark,))
+        return nodes
+
+    def read_journal(self):
+        # the journal of a failed run, None if there is none
+        if not os.path.exists(self.journalPath):
+            return None
+        with open(self.journalPath, 'r') as f:
+            return json.load(f)
+
+    def start_journal(self):
+        failedRun = self.read_journal()
+        if self.args.resume and failedRun is not None:
+            self.journal = failedRun
+            print(f'Resuming the run started {self.journal["started"]}')
+            if os.path.isdir(self.journal.get('tmpDir') or ''):
+                self.tmpDir = self.journal['tmpDir']
+            else:
+                self.journal['steps'] = {}
+                self.journal['sources'] = {}
+            # packages whose build trees are gone start over
+            for package, trees in list(self.journal['sources'].items()):
+                if not all(os.path.exists(tree) for tree in trees):
+                    self.journal['steps'].pop(package, None)
+                    del self.journal['sources'][package]
+            self.sourceTrees.update(self.journal['sources'])
+        else:
+            if self.args.resume:
+                print('There is no failed run to resume')
+            if failedRun is not None:
+                # the build trees a failed run kept for --resume
+                shutil.rmtree(failedRun.get('tmpDir') or '', ignore_errors=True)
+            self.journal['started'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.journal['sources'] = self.sourceTrees
+
+    def run_installation(self, nodes):
+        # sources of the packages which will certainly be built from source are fetched right away,
+        # so that downloading and unpacking them overlaps with the other builds (the datasets come from the dataset store)
+        installDirs = {
+            'cmake': ('cmake', f'cmake-{self.cmakeVersion}'), 'gsl': ('GSL', f'gsl-{self.config["versions"]["GSL"]}'),
+            'boost': ('Boost', f'boost-{self.boostVersion}'), 'eigen': ('Eigen', f'eigen-{self.eigenVersion}'),
+            'collier': ('COLLIER', f'COLLIER-{self.collierVersion}'), 'looptools': ('LoopTools', f'LoopTools-{self.ltVersion}'),
+            'higgstools': ('HiggsTools', f'HiggsTools-{self.htVersion}'), 'gm2calc': ('GM2Calc', f'GM2Calc-{self.config["versions"]["GM2Calc"]}'),
+            'himalaya': ('Himalaya', f'Himalaya-{self.himalayaVersion}'),
+        }
+        builds = [installDirs[name][0] for name in nodes if name in installDirs and not os.path.exists(os.path.join(self.depsPath, installDirs[name][1]))]
+        # a dataset which has no version in the dataset store yet is downloaded as archive and unpacked in the build directory too
+        datasets = {'hbdataset': ('HiggsBounds', self.hbVersion), 'hsdataset': ('HiggsSignals', self.hsVersion)}
+        unpacked = [package for name, (package, version) in datasets.items() if name in nodes
+                    and not os.path.exists(os.path.join(self.depsPath, f'{DATASETS[package].split("/")[1]}-v{version}'))
+                    and not glob.glob(os.path.join(self.datasetStore, 'trees', f'{package}-*.json'))]
+        if self.tmpDir is None:
+            self.tmpDir = tempfile.mkdtemp(prefix='install-flexiblesusy-', dir=self.build_root(builds + unpacked, max(1, int(self.args.jobs))))
+        self.journal['tmpDir'] = self.tmpDir
+        self.save_journal()
+        if self.artifactDir is None or self.args.artifact_mode == 'write':
+            for package in builds:
+                self.prefetch(package)
+        if not os.path.exists(os.path.join(self.prefix, f'FlexibleSUSY-{self.config["versions"]["FlexibleSUSY"]}')):
+            self.prefetch('FlexibleSUSY', self.prefix)
+
+        cacheStats = self.compiler_cache_stats()
+        succeeded = False
+        try:
+            run_graph(nodes, max(1, int(self.args.jobs)))
+            succeeded = True
+        finally:
+            self.fetchPool.shutdown(wait=True, cancel_futures=True)
+            if succeeded:
+                shutil.rmtree(self.tmpDir, ignore_errors=True)
+                os.remove(self.journalPath)
+            elif self.args.keep_failed:
+                self.save_journal()
+                print(f'The build trees ({tree_size(self.tmpDir) / 1024**2:.0f} MB) are kept in {self.tmpDir}, run the script again with --resume to continue')
+            else:
+                # packages which got configured keep their build trees, so that --resume continues with an incremental build,
+                # unless they are on a tmpfs where they would hold on to the memory until the next run (only --keep-failed keeps them there)
+                inMemory = in_memory(self.tmpDir)
+                for package in list(self.sourceTrees):
+                    if inMemory or not self.step_done(package, 'configure'):
+                        for tree in self.sourceTrees.pop(package):
+                            shutil.rmtree(tree, ignore_errors=True)
+                self.journal['steps'] = {package: steps for package, steps in self.journal['steps'].items() if package in self.sourceTrees or package == 'FlexibleSUSY'}
+                self.save_journal()
+                if inMemory:
+                    shutil.rmtree(self.tmpDir, ignore_errors=True)
+                elif not os.listdir(self.tmpDir):
+                    os.rmdir(self.tmpDir)
+                if self.sourceTrees:
+                    size = sum(tree_size(tree) for trees in self.sourceTrees.values() for tree in trees)
+                    print(f'The build trees of {", ".join(sorted(self.sourceTrees))} ({size / 1024**2:.0f} MB) are kept in {self.tmpDir}')
+                elif inMemory:
+                    print(f'The build trees in {self.tmpDir} (memory) were removed, run the script with --keep-failed to keep them for --resume')
+                print('Run the script again with --resume to continue the installation')
+            if self.report:
+                self.print_summary()
+            if self.args.report:
+                self.write_report(self.args.report)
+            if self.args.trace:
+                self.write_trace(self.args.trace)
+            with self.loggersLock:
+                for logger in self.loggers.values():
+                    for handler in logger.handlers:
+                        handler.close()
+        if cacheStats is not None and self.compiler_cache_stats() is not None:
+            hits, misses = [after - before for before, after in zip(cacheStats, self.compiler_cache_stats())]
+            print(f'Compiler cache ({os.path.basename(self.launcher)}): {hits} hits, {misses} misses')
@@ -0,0 +1,244 @@
+import yaml
+import os
+import sys
+import argparse
+import subprocess
+import tempfile
+import shutil
+import pathlib
+import itertools
+import random
+import math
+import json
+import time
+import array
+import concurrent.futures
+import signal
+
+# Runs a parameter scan with the spectrum generator of a model installed by install.py.
+# The scan is described by a YAML file, e.g.
+#
+#   model: MSSM
+#   input: models/MSSM/LesHouches.in.MSSM  # template, default: the example input of the model
+#   parameters:
+#     - {name: m0, block: MINPAR, index: 1, grid: {start: 100, stop: 2000, steps: 20}}
+#     - {name: tanb, block: MINPAR, index: 3, values: [5, 10, 50]}
+#     - {name: A0, block: MINPAR, index: 5, random: {min: -3000, max: 3000}}
+#   points: 10000  # number of random points, only if a parameter is sampled randomly
+#   seed: 1
+#   outputs:
+#     - {name: Mh, block: MASS, index: 25}
+#
+# Grid and list parameters span a grid, with random parameters every point is drawn at random
+# (random: {min, max, log: true} samples logarithmically). The results are written to a directory
+# with one file of float64 values per column (point, status, time, parameters, outputs), which
+# e.g. numpy.fromfile reads directly, and columns.json describing them.
+
+CHUNK = 256
+
+def parameter_name(parameter):
+    return parameter.get('name') or f'{parameter["block"]}_{parameter["index"]}'
+
+def slha_key(block, index):
+    index = index if isinstance(index, list) else [index]
+    return block.upper(), tuple(int(i) for i in index)
+
+def grid_values(parameter):
+    if 'values' in parameter:
+        return [float(v) for v in parameter['values']]
+    grid = parameter['grid']
+    steps = int(grid['steps'])
+    if grid.get('log'):
+        return [grid['start'] * (grid['stop'] / grid['start']) ** (i / max(1, steps - 1)) for i in range(steps)]
+    return [grid['start'] + (grid['stop'] - grid['start']) * i / max(1, steps - 1) for i in range(steps)]
+
+def scan_points(spec):
+    # the points in a fixed order, so that an interrupted scan can skip the ones already done
+    parameters = spec['parameters']
+    randomParameters = [p for p in parameters if 'random' in p]
+    if not randomParameters:
+        for values in itertools.product(*[grid_values(p) for p in parameters]):
+            yield list(values)
+        return
+    rng = random.Random(spec.get('seed', 0))
+    fixed = [grid_values(p) if 'random' not in p else None for p in parameters]
+    for _ in range(int(spec['points'])):
+        point = []
+        for parameter, values in zip(parameters, fixed):
+            if values is not None:
+                point.append(rng.choice(values))
+            elif parameter['random'].get('log'):
+                point.append(math.exp(rng.uniform(math.log(parameter['random']['min']), math.log(parameter['random']['max']))))
+            else:
+                point.append(rng.uniform(parameter['random']['min'], parameter['random']['max']))
+        yield point
+
+def block_of(tokens):
+    if tokens and tokens[0].upper() == 'BLOCK' and len(tokens) > 1:
+        return tokens[1].upper()
+    return None
+
+def set_parameters(template, values):
+    # values maps (block, index) to a number, entries the template doesn't have are added to their block
+    lines = template.splitlines()
+    pending = dict(values)
+    headers = {}
+    block = None
+    for i, line in enumerate(lines):
+        tokens = line.split('#')[0].split()
+        if block_of(tokens) is not None:
+            block = block_of(tokens)
+            headers[block] = i
+        elif tokens and tokens[0].upper() == 'DECAY':
+            block = None
+        elif tokens and block is not None:
+            try:
+                key = (block, tuple(int(t) for t in tokens[:-1]))
+            except ValueError:
+                continue
+            if key in pending:
+                lines[i] = f'   {" ".join(str(j) for j in key[1])}   {pending.pop(key):.16e}'
+    additions = {}
+    for (block, index), value in pending.items():
+        additions.setdefault(block, []).append(f'   {" ".join(str(j) for j in index)}   {value:.16e}')
+    for block in sorted(additions, key=lambda b: -headers.get(b, len(lines))):
+        if block in headers:
+            lines[headers[block] + 1:headers[block] + 1] = additions[block]
+        else:
+            lines += [f'Block {block}'] + additions[block]
+    return '\n'.join(lines) + '\n'
+
+def read_slha(path):
+    # numerical entries of all blocks, keyed by (block, index)
+    entries = {}
+    block = None
+    with open(path, 'r') as f:
+        for line in f:
+            tokens = line.split('#')[0].split()
+            if block_of(tokens) is not None:
+                block = block_of(tokens)
+            elif tokens and tokens[0].upper() == 'DECAY':
+                block = None
+            elif len(tokens) > 1 and block is not None:
+                try:
+                    entries[(block, tuple(int(t) for t in tokens[:-1]))] = float(tokens[-1])
+                except ValueError:
+                    pass
+    return entries
+
+def run_point(executable, template, keys, outputs, point, scratch, timeout):
+    # returns status, wall time and the outputs of a single point, the SLHA files only live in the scratch directory
+    inputPath = os.path.join(scratch, f'{point[0]}.in')
+    outputPath = os.path.join(scratch, f'{point[0]}.out')
+    with open(inputPath, 'w') as f:
+        f.write(set_parameters(template, dict(zip(keys, point[1]))))
+    start = time.perf_counter()
+    try:
+        status = subprocess.run([executable, f'--slha-input-file={inputPath}', f'--slha-output-file={outputPath}'], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=timeout).returncode
+    except subprocess.TimeoutExpired:
+        status = -1
+    wall = time.perf_counter() - start
+    entries = read_slha(outputPath) if os.path.exists(outputPath) else {}
+    for path in [inputPath, outputPath]:
+        if os.path.exists(path):
+            os.remove(path)
+    return status, wall, [entries.get(slha_key(o['block'], o['index']), math.nan) for o in outputs]
+
+def open_results(outputDir, spec, columns, resume):
+    # returns the points already done, columns which were written only partly by an interrupted run are cut back
+    metadataPath = os.path.join(outputDir, 'columns.json')
+    if os.path.exists(metadataPath):
+        if not resume:
+            print(f'{outputDir} already contains a scan, use --resume to continue it')
+            sys.exit(1)
+        with open(metadataPath, 'r') as f:
+            metadata = json.load(f)
+        if metadata['spec'] != spec:
+            print(f'The scan in {outputDir} was started with a different specification')
+            sys.exit(1)
+        paths = [os.path.join(outputDir, f'{c}.f64') for c in columns]
+        rows = min(os.path.getsize(p) // 8 if os.path.exists(p) else 0 for p in paths)
+        for p in paths:
+            with open(p, 'ab') as f:
+                f.truncate(rows * 8)
+        done = array.array('d')
+        with open(os.path.join(outputDir, 'point.f64'), 'rb') as f:
+            done.fromfile(f, rows)
+        return set(int(p) for p in done)
+    os.makedirs(outputDir, exist_ok=True)
+    with open(metadataPath, 'w') as f:
+        json.dump({'spec': spec, 'columns': columns, 'format': 'one file <column>.f64 per column, float64, native byte order'}, f, indent=2)
+    return set()
+
+def flush(outputDir, columns, buffers):
+    for column, buffer in zip(columns, buffers):
+        with open(os.path.join(outputDir, f'{column}.f64'), 'ab') as f:
+            buffer.tofile(f)
+        del buffer[:]
+
+def scratch_dir():
+    # the SLHA files of every point are written to a tmpfs if there is one
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return tempfile.mkdtemp(prefix='flexiblesusy-scan-', dir='/dev/shm')
+    return tempfile.mkdtemp(prefix='flexiblesusy-scan-')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Parameter scan with a FlexibleSUSY spectrum generator')
+    parser.add_argument('spec', help='YAML file describing the scan')
+    parser.add_argument('-o', '--output', required=True, help='directory of the results')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='number of points computed at the same time')
+    parser.add_argument('--resume', action='store_true', help='continue an interrupted scan in the output directory')
+    parser.add_argument('--timeout', type=float, help='seconds after which a point is given up (status -1)')
+    args = parser.parse_args()
+
+    with open(args.spec, 'r') as f:
+        spec = yaml.safe_load(f)
+    fsInstallPath = pathlib.Path(__file__).parent.resolve()
+    model = spec['model']
+    executable = os.path.join(fsInstallPath, 'models', model, f'run_{model}.x')
+    if not os.path.exists(executable):
+        print(f'{executable} not found, install FlexibleSUSY with the model {model} first')
+        sys.exit(1)
+    with open(os.path.join(fsInstallPath, spec.get('input') or os.path.join('models', model, f'LesHouches.in.{model}')), 'r') as f:
+        template = f.read()
+    keys = [slha_key(p['block'], p['index']) for p in spec['parameters']]
+    outputs = spec.get('outputs') or []
+    columns = ['point', 'status', 'time'] + [parameter_name(p) for p in spec['parameters']] + [o['name'] for o in outputs]
+    done = open_results(args.output, spec, columns, args.resume)
+    if done:
+        print(f'Resuming, {len(done)} points already done')
+
+    # batch systems stop jobs with SIGTERM, the points finished so far are still written
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+    scratch = scratch_dir()
+    buffers = [array.array('d') for _ in columns]
+    finished = 0
+    failed = 0
+    start = time.time()
+    points = ((i, values) for i, values in enumerate(scan_points(spec)) if i not in done)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as pool:
+            # every worker waits for its own spectrum generator process, at most two points per worker are in flight
+            # so that the points of a large scan are not all queued at once
+            inFlight = {}
+            while True:
+                for point in itertools.islice(points, 2 * args.jobs - len(inFlight)):
+                    inFlight[pool.submit(run_point, executable, template, keys, outputs, point, scratch, args.timeout)] = point
+                if not inFlight:
+                    break
+                completed, _ = concurrent.futures.wait(inFlight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in completed:
+                    point = inFlight.pop(future)
+                    status, wall, values = future.result()
+                    for buffer, value in zip(buffers, [point[0], status, wall] + point[1] + values):
+                        buffer.append(value)
+                    finished += 1
+                    failed += status != 0
+                if len(buffers[0]) >= CHUNK:
+                    flush(args.output, columns, buffers)
+                    print(f'\r{len(done) + finished} points, {failed} failed, {finished / (time.time() - start):.1f} points/s', end='', flush=True)
+    finally:
+        # whatever finished is kept, also when the scan is interrupted
+        flush(args.output, columns, buffers)
+        shutil.rmtree(scratch, ignore_errors=True)
+    print(f'\r{len(done) + finished} points, {failed} failed, results in {args.output}')
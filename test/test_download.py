@@ -0,0 +1,137 @@
+import http.server
+import os
+import re
+import sys
+import threading
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from install_flexiblesusy import core
+
+DATA = bytes(range(256)) * 4096
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    # /file serves DATA with ranges, the other paths misbehave the way real mirrors do
+    protocol_version = 'HTTP/1.1'
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        Handler.requests.append((self.path, self.headers.get('Range')))
+        calls = sum(1 for path, _ in Handler.requests if path == self.path)
+        match = re.match(r'bytes=(\d+)-', self.headers.get('Range') or '')
+        if self.path == '/missing':
+            self.send_error(404)
+        elif self.path in ['/redirect', '/loop']:
+            self.send_response(302)
+            self.send_header('Location', '/file' if self.path == '/redirect' else '/loop')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.path == '/unavailable' and calls == 1:
+            self.send_error(503)
+        elif self.path in ['/drop', '/norange', '/badrange'] and calls == 1:
+            # the connection breaks after half of the file
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(DATA)))
+            self.end_headers()
+            self.wfile.write(DATA[:len(DATA) // 2])
+            self.close_connection = True
+        elif match and self.path != '/norange':
+            # /badrange answers every range with the start of the file
+            start = int(match.group(1)) if self.path != '/badrange' else 0
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(DATA) - 1}/{len(DATA)}')
+            self.send_header('Content-Length', str(len(DATA) - start))
+            self.end_headers()
+            self.wfile.write(DATA[start:])
+        else:
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(DATA)))
+            self.end_headers()
+            self.wfile.write(DATA)
+
+class TestDownload(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        # the connections kept open for the next download
+        with core.connections.lock:
+            for idle in core.connections.idle.values():
+                for connection in idle:
+                    connection.close()
+            core.connections.idle.clear()
+
+    def setUp(self):
+        Handler.requests.clear()
+        patcher = mock.patch.object(core, 'DOWNLOAD_BACKOFF', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def url(self, path):
+        return f'http://127.0.0.1:{self.server.server_port}{path}'
+
+    def download(self, *paths):
+        stream = core.MirrorStream([self.url(p) for p in paths], timeout=5, retries=2)
+        try:
+            return b''.join(iter(lambda: stream.read(65536), b''))
+        finally:
+            stream.close()
+
+    def test_resume_after_dropped_connection(self):
+        self.assertEqual(self.download('/drop'), DATA)
+        self.assertEqual(Handler.requests, [('/drop', None), ('/drop', f'bytes={len(DATA) // 2}-')])
+
+    def test_server_ignoring_range(self):
+        # the whole file comes again, the part which was already read is skipped
+        self.assertEqual(self.download('/norange'), DATA)
+        self.assertEqual(Handler.requests, [('/norange', None), ('/norange', f'bytes={len(DATA) // 2}-')])
+
+    def test_redirect(self):
+        self.assertEqual(self.download('/redirect'), DATA)
+        self.assertEqual([path for path, _ in Handler.requests], ['/redirect', '/file'])
+        body, _ = core.http_get(self.url('/redirect'))
+        self.assertEqual(body, DATA)
+
+    def test_retry_after_503(self):
+        self.assertEqual(self.download('/unavailable'), DATA)
+        self.assertEqual([path for path, _ in Handler.requests], ['/unavailable', '/unavailable'])
+
+    def test_failover_after_404(self):
+        # a 404 isn't retried, the next mirror is used right away
+        self.assertEqual(self.download('/missing', '/file'), DATA)
+        self.assertEqual([path for path, _ in Handler.requests], ['/missing', '/file'])
+
+    def test_wrong_content_range(self):
+        # the mirror isn't asked again, the next one continues where the transfer broke off
+        self.assertEqual(self.download('/badrange', '/file'), DATA)
+        self.assertEqual(Handler.requests, [('/badrange', None), ('/badrange', f'bytes={len(DATA) // 2}-'), ('/file', f'bytes={len(DATA) // 2}-')])
+        Handler.requests.clear()
+        with self.assertRaises(core.DownloadError) as error:
+            self.download('/badrange')
+        self.assertIsNone(error.exception.status)
+
+    def test_redirect_loop(self):
+        self.assertEqual(self.download('/loop', '/file'), DATA)
+        with self.assertRaises(core.DownloadError) as error:
+            core.http_get(self.url('/loop'))
+        self.assertIsNone(error.exception.status)
+        self.assertEqual(error.exception.reason, 'too many redirects')
+
+    def test_404_without_mirror(self):
+        with self.assertRaises(core.DownloadError) as error:
+            self.download('/missing')
+        self.assertEqual(error.exception.status, 404)
+
+if __name__ == '__main__':
+    unittest.main()